@@ -17,6 +17,12 @@ from iam.config import BOT_TOKEN, PREFIX
 LOG = None
 INTENTS = Intents.all()
 
+IGNORED_ERRORS = (
+    CommandNotFound, DisabledCommand, MissingRequiredArgument,
+    TooManyArguments, ArgumentParsingError, BadArgument
+)
+IGNORED_ERROR_TYPES = frozenset(IGNORED_ERRORS)
+
 def main():
     global LOG
     new_logger("discord", f_level=INFO)
@@ -57,12 +63,8 @@ def main():
         Raises:
             Any exception that is not handled by the above.
         """
-        if isinstance(error, CommandNotFound) \
-            or isinstance(error, DisabledCommand) \
-            or isinstance(error, MissingRequiredArgument) \
-            or isinstance(error, TooManyArguments) \
-            or isinstance(error, ArgumentParsingError) \
-            or isinstance(error, BadArgument):
+        if type(error) in IGNORED_ERROR_TYPES \
+            or isinstance(error, IGNORED_ERRORS):
             return
 
         if hasattr(error, "original"):
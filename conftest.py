@@ -0,0 +1,112 @@
+"""Shared pytest fixtures."""
+
+import pytest
+from asyncio import new_event_loop
+from unittest.mock import AsyncMock, MagicMock
+import discord
+
+MOCK_SPECS = [
+    discord.Member, discord.Guild, discord.TextChannel, discord.Message,
+    discord.Attachment
+]
+
+@pytest.fixture(scope="session")
+def event_loop():
+    """One event loop shared by all async tests and fixtures."""
+    loop = new_event_loop()
+    yield loop
+    loop.close()
+
+@pytest.fixture(scope="session", autouse=True)
+def _warm():
+    """Build one mock of each discord spec before any test runs.
+
+    The first spec'd mock in a session pays one-off introspection costs,
+    which would otherwise be counted against whichever test runs first.
+    """
+    for spec in MOCK_SPECS:
+        AsyncMock(spec=spec)
+    yield
+
+@pytest.fixture(scope="session")
+def mock_member_factory():
+    """Callable building a fresh mock member with the given ID."""
+    def make(id):
+        member = AsyncMock(spec=discord.Member)
+        member.id = id
+        member.mention = f"@User_{member.id}#0000"
+        member.typing = MagicMock()
+        return member
+    return make
+
+@pytest.fixture(scope="session")
+def mock_guild_factory():
+    """Callable building a fresh mock guild with the given ID."""
+    def make(id):
+        guild = AsyncMock(spec=discord.Guild)
+        guild.id = id
+        return guild
+    return make
+
+@pytest.fixture(scope="session")
+def mock_channel_factory():
+    """Callable building a fresh mock text channel with the given ID."""
+    def make(id):
+        channel = AsyncMock(spec=discord.TextChannel)
+        channel.id = id
+        channel.typing = MagicMock()
+        return channel
+    return make
+
+@pytest.fixture(scope="session")
+def mock_message_factory():
+    """Callable building a fresh mock message with the given ID."""
+    def make(id, attachments=[]):
+        message = AsyncMock(spec=discord.Message)
+        message.id = id
+        message.attachments = attachments
+        return message
+    return make
+
+@pytest.fixture(scope="session")
+def mock_attachment_factory():
+    """Callable building a fresh mock attachment.
+
+    The given ID is returned by the attachment's to_file method.
+    """
+    def make(id):
+        attachment = AsyncMock(spec=discord.Attachment)
+        attachment.to_file.return_value = id
+        return attachment
+    return make
+
+@pytest.fixture
+def mock_db():
+    """Mock database."""
+    return MagicMock()
+
+@pytest.fixture
+def mock_member(mock_member_factory):
+    """Fresh mock member with ID 0."""
+    return mock_member_factory(0)
+
+@pytest.fixture
+def mock_admin_channel(mock_channel_factory):
+    """Fresh mock admin channel with ID 1."""
+    return mock_channel_factory(1)
+
+@pytest.fixture(scope="module")
+def _attachment_pool(mock_attachment_factory):
+    """Ten mock attachments, built once per module."""
+    return tuple(mock_attachment_factory(i) for i in range(10))
+
+@pytest.fixture
+def mock_attachments(_attachment_pool):
+    """Shared pool of mock attachments with call records cleared.
+
+    to_file of the attachment at index i returns i. Tests take a slice of
+    the pool rather than building their own attachments.
+    """
+    for attachment in _attachment_pool:
+        attachment.reset_mock()
+    return _attachment_pool
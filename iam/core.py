@@ -1,5 +1,6 @@
 """Handle core functions of the bot."""
 
+from functools import lru_cache
 from inspect import getdoc
 from discord.ext.commands import (
     Cog, Group, command, BadArgument, MissingRequiredArgument, 
@@ -16,17 +17,29 @@ LOG = new_logger(__name__)
 COG_NAME = "Core"
 """Name of this module's Cog."""
 
+_USAGE_ERRORS = (
+    MissingRequiredArgument, TooManyArguments, ArgumentParsingError,
+    BadArgument
+)
+"""Command errors caused by incorrect command usage."""
+
+_USAGE_ERROR_TYPES = frozenset(_USAGE_ERRORS)
+"""Exact types in _USAGE_ERRORS, for lookup before the isinstance check."""
+
+HELP_ATTR = "_help_text_cached"
+"""Name of Command attribute that generated help text is stored in."""
+
 def setup(bot):
     """Add Core cog to bot and set up logging.
 
     Args:
         bot: Bot object to add cog to.
     """
-    LOG.debug(f"Setting up {__name__} extension...")
+    LOG.debug("Setting up %s extension...", __name__)
     cog = Core(bot, LOG)
-    LOG.debug(f"Initialised {COG_NAME} cog")
+    LOG.debug("Initialised %s cog", COG_NAME)
     bot.add_cog(cog)
-    LOG.debug(f"Added {COG_NAME} cog to bot")
+    LOG.debug("Added %s cog to bot", COG_NAME)
 
 def teardown(bot):
     """Remove Core cog from bot and remove logging.
@@ -34,23 +47,12 @@ def teardown(bot):
     Args:
         bot: Bot object to remove cog from.
     """
-    LOG.debug(f"Tearing down {__name__} extension...")
+    LOG.debug("Tearing down %s extension...", __name__)
     bot.remove_cog(COG_NAME)
-    LOG.debug(f"Removed {COG_NAME} cog from bot")
-    for handler in LOG.handlers:
+    LOG.debug("Removed %s cog from bot", COG_NAME)
+    for handler in list(LOG.handlers):
         LOG.removeHandler(handler)
 
-async def show_help_all(bot, target):
-    """Send help text for all commands to target.
-
-    Args:
-        bot: Bot to generate help text for.
-        target: Object to send message to.
-    """
-    out = ["**All commands:**"] + [make_help_text(cmd) for cmd in bot.commands
-        if not cmd.hidden]
-    await target.send("\n".join(out))
-
 async def show_help_single(bot, target, query):
     """Send help text for queried command to target.
 
@@ -61,11 +63,24 @@ async def show_help_single(bot, target, query):
         target: Object to send message to.
         query: String representing command to search for.
     """
-    cmd = bot.get_command(query)
+    cmd = resolve_command(bot, query)
     if cmd is None or cmd.hidden:
         await target.send("No such command exists!")
         return
-    await target.send(f"Usage: {make_help_text(cmd)}")
+    await target.send(f"Usage: {get_help_text(cmd)}")
+
+@lru_cache(maxsize=128)
+def resolve_command(bot, query):
+    """Look up command by name, reusing result of previous identical lookups.
+
+    Args:
+        bot: Bot to search for command in.
+        query: String representing command to search for.
+
+    Returns:
+        Command object matching query, or None if no such command exists.
+    """
+    return bot.get_command(query)
 
 class Core(Cog, name=COG_NAME):
     """Handle core functions of the bot.
@@ -79,15 +94,57 @@ class Core(Cog, name=COG_NAME):
         Args:
             bot: Bot object that registered this cog.
         """
-        LOG.debug(f"Initialising {COG_NAME} cog...")
+        LOG.debug("Initialising %s cog...", COG_NAME)
         self.bot = bot
         self.logger = logger
         self.bot.remove_command("help")
+        self._help_all = None
+
+    def cog_unload(self):
+        """Discard cached help text when cog is removed.
+
+        Help text stored on Command objects is left in place, since reloaded
+        extensions create new Command objects.
+        """
+        self._help_all = None
+        resolve_command.cache_clear()
+
+    def refresh_help(self):
+        """Regenerate help text for all commands from current command set.
+
+        Help text for each visible command and subcommand is stored on the
+        Command object itself.
+        """
+        resolve_command.cache_clear()
+        for cmd in self.bot.walk_commands():
+            if not cmd.hidden:
+                setattr(cmd, HELP_ATTR, make_help_text(cmd))
+        visible_commands = [cmd for cmd in self.bot.commands
+            if not cmd.hidden]
+        self._help_all = "\n".join(["**All commands:**"]
+            + [get_help_text(cmd) for cmd in visible_commands])
+
+    async def show_help_all(self, target):
+        """Send help text for all commands to target.
+
+        Help text is generated once the bot is ready and reused afterwards, as
+        the command set does not change once the bot has started.
+
+        Args:
+            target: Object to send message to.
+        """
+        if self._help_all is None:
+            self.refresh_help()
+        await target.send(self._help_all)
 
     @Cog.listener()
     async def on_ready(self):
-        """Log message on bot startup."""
-        LOG.info(f"Bot running with command prefix '{PREFIX}'")
+        """Log message on bot startup and generate help text.
+
+        Also runs on reconnect, so help text is refreshed then too.
+        """
+        self.refresh_help()
+        LOG.info("Bot running with command prefix '%s'", PREFIX)
 
     @Cog.listener()
     async def on_command_error(self, ctx, error):
@@ -100,11 +157,11 @@ class Core(Cog, name=COG_NAME):
             ctx: Context object associated with event/command that raised.
             error: CommandError object generated by discord.py
         """
-        if (isinstance(error, MissingRequiredArgument) \
-            or isinstance(error, TooManyArguments) \
-            or isinstance(error, ArgumentParsingError) \
-            or isinstance(error, BadArgument)) \
-            and ctx.channel.id == ADMIN_CHANNEL:
+        # Exact type lookup covers the common case; isinstance catches
+        # subclasses such as BadUnionArgument.
+        is_usage_error = type(error) in _USAGE_ERROR_TYPES \
+            or isinstance(error, _USAGE_ERRORS)
+        if is_usage_error and ctx.channel.id == ADMIN_CHANNEL:
             await show_help_single(self.bot, ctx, ctx.command.qualified_name)
 
     @command(
@@ -130,10 +187,25 @@ class Core(Cog, name=COG_NAME):
                    Optional.
         """
         if len(query) == 0:
-            await show_help_all(self.bot, ctx)
+            await self.show_help_all(ctx)
         else:
             await show_help_single(self.bot, ctx, " ".join(query))
 
+def get_help_text(cmd):
+    """Retrieve help text for command, generating it if not yet cached.
+
+    Args:
+        cmd: Command object to retrieve help text for.
+
+    Returns:
+        String representing help text of command.
+    """
+    help = getattr(cmd, HELP_ATTR, None)
+    if help is None:
+        help = make_help_text(cmd)
+        setattr(cmd, HELP_ATTR, help)
+    return help
+
 def make_help_text(cmd):
     """Generate help text for command.
 
@@ -154,16 +226,13 @@ def make_help_text(cmd):
     help = [f"**{PREFIX}{cmd.qualified_name}** {cmd.usage}", cmd.help]
 
     # Append aliases.
-    if len(cmd.aliases) > 0:
-        aliases = ["__Aliases__"]
-        aliases += [f"{PREFIX}{a}" for a in cmd.aliases]
-        help.append(" | ".join(aliases))
-    
+    if cmd.aliases:
+        help.append("__Aliases__ | "
+            + " | ".join(PREFIX + a for a in cmd.aliases))
+
     # Append subcommands.
-    if isinstance(cmd, Group) \
-        and len(cmd.commands) > 0:
-        subs = ["__Subcommands__"]
-        subs += [f"{PREFIX}{c.qualified_name}" for c in cmd.commands]
-        help.append(" | ".join(subs))
+    if isinstance(cmd, Group) and cmd.commands:
+        help.append("__Subcommands__ | "
+            + " | ".join(PREFIX + c.qualified_name for c in cmd.commands))
 
     return "\n".join(help)
@@ -1,9 +1,13 @@
 """Handle email functions."""
 
-import boto3
-from botocore.exceptions import ClientError
+from asyncio import (
+    CancelledError, Event, Lock, TimeoutError, ensure_future, gather,
+    get_running_loop, wait_for
+)
+from functools import lru_cache, partial
+from json import dumps
 from discord.ext.commands import Cog
-from re import search
+from string import ascii_letters, digits
 
 from iam.log import new_logger
 from iam.config import (
@@ -16,8 +20,26 @@ LOG = new_logger(__name__)
 COG_NAME = "Mail"
 """Name of this module's cog."""
 
-EMAIL_REGEX = r"^([a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+)$"
-"""Any string that matches this regex is a valid email."""
+EMAIL_LOCAL_CHARS = frozenset(ascii_letters + digits + "_.+-")
+"""Characters allowed in the local part of a valid email."""
+
+EMAIL_DOMAIN_CHARS = frozenset(ascii_letters + digits + ".-")
+"""Characters allowed in the domain of a valid email."""
+
+MAX_EMAIL_LEN = 254
+"""Maximum length of a valid email address."""
+
+MAX_BULK_DESTINATIONS = 50
+"""Maximum number of destinations Amazon SES accepts per bulk send."""
+
+FLUSH_INTERVAL = 0.2
+"""Maximum seconds a queued email waits for others to be sent with it."""
+
+PLAINTEXT_TEMPLATE = "iam-plaintext"
+"""Name of SES template used to send queued plaintext emails in bulk."""
+
+CHARSET = "UTF-8"
+"""Character set of email subject and body text."""
 
 def setup(bot):
     """Add Mail cog to bot and set up logging.
@@ -25,18 +47,18 @@ def setup(bot):
     Args:
         bot: Bot object to add cog to.
     """
-    LOG.debug(f"Setting up {__name__} extension...")
+    LOG.debug("Setting up %s extension...", __name__)
     cog = Mail(LOG)
-    LOG.debug(f"Initialised {COG_NAME} cog")
+    LOG.debug("Initialised %s cog", COG_NAME)
     bot.add_cog(cog)
-    LOG.debug(f"Added {COG_NAME} cog to bot")
+    LOG.debug("Added %s cog to bot", COG_NAME)
 
 def teardown(bot):
-    LOG.debug(f"Tearing down {__name__} extension")
     """Remove Mail cog from bot and remove logging."""
+    LOG.debug("Tearing down %s extension", __name__)
     bot.remove_cog(COG_NAME)
-    LOG.debug(f"Removed {COG_NAME} cog from bot")
-    for handler in LOG.handlers:
+    LOG.debug("Removed %s cog from bot", COG_NAME)
+    for handler in list(LOG.handlers):
         LOG.removeHandler(handler)
 
 class MailError(Exception):
@@ -45,6 +67,8 @@ class MailError(Exception):
     Attributes:
         recipient: String representing recipient email address.
     """
+    __slots__ = ("recipient",)
+
     def __init__(self, recipient):
         """Init exception with given message.
 
@@ -58,30 +82,275 @@ class MailError(Exception):
 
         Log msg as error.
         """
-        LOG.error(f"Email for recipient '{self.recipient}' failed to send")
+        LOG.error("Email for recipient '%s' failed to send", self.recipient)
 
+@lru_cache(maxsize=1024)
 def is_valid_email(email):
     """Returns whether given string is a valid email.
 
+    A valid email is a non-empty local part made of EMAIL_LOCAL_CHARS, then
+    "@", then a domain made of EMAIL_DOMAIN_CHARS with at least one character
+    on either side of its first ".".
+
     Args:
         email: String to validate.
 
     Returns:
         Boolean value representing whether string is a valid email.
     """
-    return search(EMAIL_REGEX, email) is not None
+    if len(email) > MAX_EMAIL_LEN:
+        return False
+    local, at, domain = email.partition("@")
+    dot = domain.find(".")
+    return bool(local) and bool(at) and 0 < dot < len(domain) - 1 \
+        and EMAIL_LOCAL_CHARS.issuperset(local) \
+        and EMAIL_DOMAIN_CHARS.issuperset(domain)
+
+async def run_blocking(func, *args, **kwargs):
+    """Run blocking function in the default executor.
+
+    Keeps the event loop free to handle other events while func waits on
+    network I/O.
+
+    Args:
+        func: Function to run.
+        *args: Args to supply to func.
+        **kwargs: Keyword args to supply to func.
+
+    Returns:
+        Return value of func.
+    """
+    return await get_running_loop().run_in_executor(None,
+        partial(func, *args, **kwargs))
+
+def fail_pending(pending):
+    """Set MailError on each queued email not yet resolved.
+
+    Args:
+        pending: List of (recipient, subject, body text, future) tuples.
+    """
+    for recipient, _, _, future in pending:
+        if not future.done():
+            future.set_exception(MailError(recipient))
+
+def error_code(err):
+    """Returns error code of Amazon SES ClientError.
+
+    Args:
+        err: ClientError raised by SES client.
+
+    Returns:
+        String representing error code, or None if err has none.
+    """
+    return getattr(err, "response", {}).get("Error", {}).get("Code")
+
+def make_message(subject, body_text):
+    """Build SES Message argument for plaintext email.
+
+    Args:
+        subject: String representing subject line of email.
+        body_text: String representing plaintext body of email.
+
+    Returns:
+        Dict representing email subject and body in SES format.
+    """
+    return {
+        "Body": {"Text": {"Charset": CHARSET, "Data": body_text}},
+        "Subject": {"Charset": CHARSET, "Data": subject}
+    }
 
 class Mail(Cog, name=COG_NAME):
-    """Handle email functions"""
+    """Handle email functions
+
+    Attributes:
+        logger: Logger for this cog.
+    """
 
     def __init__(self, logger):
-        """Init cog and connect to Amazon SES."""
+        """Init cog.
+
+        Connecting to Amazon SES is deferred until an email is first sent, so
+        boto3 is not imported at startup.
+        """
         self.logger = logger
-        self.client = connect()
+        self._client = None
+        self._connect_lock = Lock()
+        self._pending = []
+        self._pending_event = Event()
+        self._batch_full = Event()
+        self._flusher = None
+        self._template_ready = False
+        self._template_usable = True
+
+    async def _get_client(self):
+        """Returns Amazon SES client, connecting on first call.
+
+        Connecting imports boto3, so it is done off the event loop. Concurrent
+        first calls share one connection.
+        """
+        async with self._connect_lock:
+            if self._client is None:
+                self._client = await run_blocking(connect)
+        return self._client
+
+    def cog_unload(self):
+        """Stop flushing queued emails when cog is removed.
 
-    def send_email(self, recipient, subject, body_text):
+        Emails still queued are failed, so their senders do not wait forever.
+        """
+        if self._flusher is not None:
+            self._flusher.cancel()
+        pending, self._pending = self._pending, []
+        fail_pending(pending)
+
+    async def send_email(self, recipient, subject, body_text):
+        """Queue plaintext email to be sent via Amazon SES.
+
+        Emails queued within FLUSH_INTERVAL of each other are sent together
+        in as few SES requests as possible. Returns once this email has been
+        sent.
+
+        Args:
+            recipient: String representing Email address of intended recipient.
+            subject: String representing subject line of email.
+            body_text: String representing body text of the email. Will be
+                       treated as plaintext.
+
+        Raises:
+            MailError: If email fails to send.
+        """
+        future = get_running_loop().create_future()
+        self._pending.append((recipient, subject, body_text, future))
+        if self._flusher is None or self._flusher.done():
+            self._flusher = ensure_future(self._flush_pending())
+        self._pending_event.set()
+        if len(self._pending) >= MAX_BULK_DESTINATIONS:
+            self._batch_full.set()
+        await future
+
+    async def _flush_pending(self):
+        """Send queued emails whenever a batch fills or FLUSH_INTERVAL passes.
+
+        Runs for the lifetime of the cog.
+        """
+        while True:
+            await self._pending_event.wait()
+            try:
+                await wait_for(self._batch_full.wait(), FLUSH_INTERVAL)
+            except TimeoutError:
+                pass
+            self._pending_event.clear()
+            self._batch_full.clear()
+            pending, self._pending = self._pending, []
+            try:
+                await self._flush(pending)
+            except CancelledError:
+                # Subclass of Exception before Python 3.8.
+                fail_pending(pending)
+                raise
+            except Exception:
+                LOG.exception("Failed to flush %s queued emails", len(pending))
+                fail_pending(pending)
+
+    async def _flush(self, pending):
+        """Send queued emails and report result to each sender.
+
+        A lone email is sent directly. Otherwise, emails are sent in bulk
+        using the plaintext template, MAX_BULK_DESTINATIONS per request.
+
+        If the template cannot be set up, or bulk sends are not permitted,
+        that request's emails are sent individually instead, as are all later
+        emails. If a bulk request fails for any other reason, such as
+        throttling, only that request's emails are failed.
+
+        Args:
+            pending: List of (recipient, subject, body text, future) tuples.
+                     Each future is resolved once its email is sent, or set
+                     to MailError if it fails.
+        """
+        if len(pending) == 1:
+            await self._flush_each(pending)
+            return
+
+        client = await self._get_client()
+        for i in range(0, len(pending), MAX_BULK_DESTINATIONS):
+            batch = pending[i:i + MAX_BULK_DESTINATIONS]
+            if not self._template_usable:
+                await self._flush_each(batch)
+                continue
+            try:
+                await self._ensure_template()
+            except client.exceptions.ClientError:
+                LOG.warning("Could not set up SES template '%s', sending "
+                    "emails individually instead", PLAINTEXT_TEMPLATE)
+                await self._flush_each(batch)
+                self._template_usable = False
+                continue
+            try:
+                failed = set(await self._send_bulk_batch(PLAINTEXT_TEMPLATE,
+                    {}, [(recipient, {"subject": subject, "body": body_text})
+                        for recipient, subject, body_text, _ in batch]))
+            except client.exceptions.ClientError as err:
+                if error_code(err) != "AccessDenied":
+                    LOG.warning("SES bulk email to %s recipients failed with "
+                        "'%s'", len(batch), error_code(err))
+                    fail_pending(batch)
+                    continue
+                LOG.warning("SES bulk email not permitted, sending emails "
+                    "individually instead")
+                await self._flush_each(batch)
+                self._template_usable = False
+                continue
+            for recipient, _, _, future in batch:
+                if future.done():
+                    continue
+                if recipient in failed:
+                    future.set_exception(MailError(recipient))
+                else:
+                    future.set_result(None)
+
+    async def _flush_each(self, pending):
+        """Send queued emails individually and report result to each sender.
+
+        Args:
+            pending: List of (recipient, subject, body text, future) tuples.
+        """
+        async def flush_one(recipient, subject, body_text, future):
+            try:
+                await self._send_single(recipient, subject, body_text)
+            except MailError as err:
+                if not future.done():
+                    future.set_exception(err)
+            else:
+                if not future.done():
+                    future.set_result(None)
+        await gather(*(flush_one(*item) for item in pending))
+
+    async def _ensure_template(self):
+        """Create plaintext template in Amazon SES if it does not exist.
+
+        Template passes subject and body through unescaped.
+        """
+        if self._template_ready:
+            return
+        client = await self._get_client()
+        try:
+            await run_blocking(client.get_template,
+                TemplateName=PLAINTEXT_TEMPLATE)
+        except client.exceptions.ClientError:
+            LOG.info("Creating SES template '%s'...", PLAINTEXT_TEMPLATE)
+            await run_blocking(client.create_template, Template={
+                "TemplateName": PLAINTEXT_TEMPLATE,
+                "SubjectPart": "{{{subject}}}",
+                "TextPart": "{{{body}}}"
+            })
+        self._template_ready = True
+
+    async def _send_single(self, recipient, subject, body_text):
         """Send plaintext email via Amazon SES.
 
+        SES request is made off the event loop.
+
         Args:
             recipient: String representing Email address of intended recipient.
             subject: String representing subject line of email.
@@ -91,40 +360,125 @@ class Mail(Cog, name=COG_NAME):
         Raises:
             MailError: If email fails to send.
         """
-        LOG.debug(f"Sending SES email to {recipient}...")
+        client = await self._get_client()
+        LOG.debug("Sending SES email to %s...", recipient)
         try:
-            response = self.client.send_email(
+            response = await run_blocking(client.send_email,
                 Destination={"ToAddresses": [recipient]},
-                Message={
-                    "Body": {
-                        "Text": {
-                            "Charset": "UTF-8",
-                            "Data": body_text
-                        }
-                    },
-                    "Subject": {
-                        "Charset": "UTF-8",
-                        "Data": subject
-                    }
-                },
+                Message=make_message(subject, body_text),
                 Source=EMAIL
             )
-            LOG.info(f"SES email '{response['MessageId']}' "
-                f"sent to '{recipient}'")
-        except ClientError:
+            LOG.info("SES email '%s' sent to '%s'", response["MessageId"],
+                recipient)
+        except client.exceptions.ClientError:
             raise MailError(recipient)
 
+    async def send_bulk(self, recipients, template_name, default_data,
+        per_recipient_data):
+        """Send templated email to multiple recipients via Amazon SES.
+
+        Recipients are batched into requests of up to MAX_BULK_DESTINATIONS
+        destinations each, rather than one request per recipient. SES requests
+        are made off the event loop.
+
+        Args:
+            recipients: List of strings representing recipient email
+                        addresses.
+            template_name: String representing name of SES template to use.
+            default_data: Dict of template data used for any value not
+                          supplied in a recipient's own data.
+            per_recipient_data: List of dicts of template data for each
+                                recipient, in the same order as recipients.
+
+        Returns:
+            List of strings representing recipients whose email failed to
+            send.
+
+        Raises:
+            ValueError: If recipients and per_recipient_data differ in length.
+        """
+        if len(recipients) != len(per_recipient_data):
+            raise ValueError(f"Got {len(per_recipient_data)} template data "
+                f"for {len(recipients)} recipients")
+        client = await self._get_client()
+        failed = []
+        pairs = list(zip(recipients, per_recipient_data))
+        for i in range(0, len(pairs), MAX_BULK_DESTINATIONS):
+            batch = pairs[i:i + MAX_BULK_DESTINATIONS]
+            try:
+                failed += await self._send_bulk_batch(template_name,
+                    default_data, batch)
+            except client.exceptions.ClientError:
+                failed += [recipient for recipient, _ in batch]
+        return failed
+
+    async def _send_bulk_batch(self, template_name, default_data, batch):
+        """Send templated email to recipients in a single SES request.
+
+        Args:
+            template_name: String representing name of SES template to use.
+            default_data: Dict of template data used for any value not
+                          supplied in a recipient's own data.
+            batch: List of up to MAX_BULK_DESTINATIONS (recipient, data)
+                   tuples, where data is a dict of template data for that
+                   recipient.
+
+        Returns:
+            List of strings representing recipients whose email failed to
+            send.
+
+        Raises:
+            ClientError: If SES refused the whole request.
+        """
+        client = await self._get_client()
+        LOG.debug("Sending SES bulk email to %s recipients...", len(batch))
+        response = await run_blocking(
+            client.send_bulk_templated_email,
+            Source=EMAIL,
+            Template=template_name,
+            DefaultTemplateData=dumps(default_data),
+            Destinations=[
+                {
+                    "Destination": {"ToAddresses": [recipient]},
+                    "ReplacementTemplateData": dumps(data)
+                }
+                for recipient, data in batch
+            ]
+        )
+        failed = []
+        for (recipient, _), status in zip(batch, response["Status"]):
+            if status["Status"] == "Success":
+                LOG.info("SES email '%s' sent to '%s'", status["MessageId"],
+                    recipient)
+            else:
+                failed.append(recipient)
+        return failed
+
 def connect():
     """Connect to Amazon SES.
     
-    Required for all other methods to function.
+    Required for all other methods to function. boto3 is imported here
+    rather than at module level, as importing it is slow.
     """
+    import boto3
+    from botocore.config import Config
+
     LOG.debug("Logging in to Amazon SES...")
+    # Allow enough pooled connections for concurrent sends run in executor
+    # threads, and keep them alive between sends.
+    config = Config(
+        max_pool_connections=50,
+        retries={"max_attempts": 3, "mode": "adaptive"},
+        tcp_keepalive=True,
+        connect_timeout=3,
+        read_timeout=10
+    )
     client = boto3.client(
         'ses',
         region_name=AWS_REGION,
         aws_access_key_id=AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=AWS_SECRET_ACCESS_KEY
+        aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
+        config=config
     )
     LOG.info("Logged in to Amazon SES")
     return client
@@ -41,7 +41,7 @@ def teardown(bot):
     LOG.debug(f"Tearing down {__name__} extension...")
     bot.remove_cog(COG_NAME)
     LOG.debug(f"Removed {COG_NAME} cog from bot")
-    for handler in LOG.handlers:
+    for handler in list(LOG.handlers):
         LOG.removeHandler(handler)
 
 class SubscriptionError(Exception):
@@ -3,7 +3,8 @@
 from enum import IntEnum
 from functools import wraps
 from time import time
-from re import search
+import re
+from asyncio import gather
 import hmac
 from discord.ext.commands import Cog, group, command
 from discord import Member, NotFound
@@ -32,6 +33,9 @@ COG_NAME = "Verify"
 ZID_REGEX = r"^[zZ][0-9]{7}$"
 """Any string that matches this regex is a valid zID."""
 
+ZID_PATTERN = re.compile(ZID_REGEX)
+"""Compiled form of ZID_REGEX."""
+
 def setup(bot):
     """Add Verify cog to bot.
 
@@ -112,7 +116,7 @@ def is_valid_zid(zid):
     Returns:
         Boolean value representing whether string is a valid zID.
     """
-    return search(ZID_REGEX, zid) is not None
+    return ZID_PATTERN.fullmatch(zid) is not None
 
 def is_verifying_user(cog, ctx, *args, **kwargs):
     """Checks that user that invoked function is undergoing verification.
@@ -415,7 +419,7 @@ async def proc_send_email(db, mail, member, member_data, email):
 
     try:
         async with member.typing():
-            mail.send_email(email, "PCSoc Discord Verification", 
+            await mail.send_email(email, "PCSoc Discord Verification",
                 f"Your code is {code}")
     except MailError as err:
         err.notify()
@@ -551,7 +555,7 @@ async def proc_forward_id_admins(db, member, admin_channel, member_data,
     """
     full_name = member_data[MemberKey.NAME]
     async with member.typing():
-        files = [await a.to_file() for a in attachments]
+        files = await gather(*(a.to_file() for a in attachments))
         message = await admin_channel.send("Received attachment(s) "
             f"from {member.mention}. Please verify that name on ID is "
             f"`{full_name}`, then type `{PREFIX}verify approve "
@@ -678,7 +682,7 @@ async def proc_resend_id(db, channel, member):
     attachments = message.attachments
 
     async with channel.typing():
-        files = [await a.to_file() for a in attachments]
+        files = await gather(*(a.to_file() for a in attachments))
         full_name = member_data[MemberKey.NAME]
         await channel.send("Previously received attachment(s) from "
             f"{member.mention}. Please verify that name on ID is "
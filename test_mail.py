@@ -0,0 +1,270 @@
+"""Test the iam.mail module."""
+
+import pytest
+from asyncio import gather, sleep, wait_for
+from json import loads
+from threading import Event, get_ident
+from unittest.mock import patch, MagicMock
+from iam.mail import Mail, MailError, MAX_BULK_DESTINATIONS
+
+class FakeClientError(Exception):
+    """Stand-in for botocore ClientError with the given error code."""
+    def __init__(self, code="MessageRejected"):
+        super().__init__(code)
+        self.response = {"Error": {"Code": code}}
+
+def new_fake_client(fail=()):
+    """Mock SES client whose sends fail for recipients in fail.
+
+    Sends to any other recipient succeed with MessageId "id-<recipient>".
+    """
+    client = MagicMock()
+    client.exceptions.ClientError = FakeClientError
+
+    def send_email(Destination, **kwargs):
+        recipient = Destination["ToAddresses"][0]
+        if recipient in fail:
+            raise FakeClientError()
+        return {"MessageId": f"id-{recipient}"}
+
+    def send_bulk_templated_email(Destinations, **kwargs):
+        statuses = []
+        for destination in Destinations:
+            recipient = destination["Destination"]["ToAddresses"][0]
+            if recipient in fail:
+                statuses.append({"Status": "MessageRejected"})
+            else:
+                statuses.append({"Status": "Success",
+                    "MessageId": f"id-{recipient}"})
+        return {"Status": statuses}
+
+    client.send_email.side_effect = send_email
+    client.send_bulk_templated_email.side_effect = send_bulk_templated_email
+    return client
+
+def make_recipients(n):
+    return [f"user{i}@example.com" for i in range(n)]
+
+def bulk_destinations(call):
+    _, kwargs = call
+    return kwargs["Destinations"]
+
+def bulk_recipients(call):
+    return [d["Destination"]["ToAddresses"][0]
+        for d in bulk_destinations(call)]
+
+@pytest.fixture
+def client():
+    """Fake SES client returned when Mail connects."""
+    client = new_fake_client()
+    with patch("iam.mail.connect", return_value=client):
+        yield client
+
+@pytest.fixture
+async def mail(client):
+    """Mail cog using the fake client, unloaded after the test."""
+    cog = Mail(MagicMock())
+    yield cog
+    cog.cog_unload()
+
+async def test_connect_off_event_loop(mail, client):
+    """Client connects once, outside the event loop thread."""
+    threads = []
+
+    def connect():
+        threads.append(get_ident())
+        return client
+
+    with patch("iam.mail.connect", side_effect=connect):
+        await gather(*(mail.send_bulk(make_recipients(2), "tmpl", {},
+            [{}, {}]) for _ in range(3)))
+
+    assert len(threads) == 1
+    assert threads[0] != get_ident()
+    assert client.send_bulk_templated_email.call_count == 3
+
+async def test_send_bulk_chunks(mail, client):
+    """Recipients are sent in requests of at most MAX_BULK_DESTINATIONS."""
+    n = MAX_BULK_DESTINATIONS * 2 + 20
+    recipients = make_recipients(n)
+    data = [{"n": i} for i in range(n)]
+
+    failed = await mail.send_bulk(recipients, "tmpl", {"n": -1}, data)
+
+    assert failed == []
+    calls = client.send_bulk_templated_email.call_args_list
+    assert [len(bulk_destinations(c)) for c in calls] \
+        == [MAX_BULK_DESTINATIONS, MAX_BULK_DESTINATIONS, 20]
+    assert sum((bulk_recipients(c) for c in calls), []) == recipients
+    sent_data = [loads(d["ReplacementTemplateData"])
+        for c in calls for d in bulk_destinations(c)]
+    assert sent_data == data
+    for _, kwargs in calls:
+        assert kwargs["Template"] == "tmpl"
+        assert loads(kwargs["DefaultTemplateData"]) == {"n": -1}
+
+async def test_send_bulk_batch_error(mail, client):
+    """Request raising ClientError fails only recipients in that request."""
+    recipients = make_recipients(MAX_BULK_DESTINATIONS + 5)
+    send = client.send_bulk_templated_email.side_effect
+
+    def fail_first(**kwargs):
+        if client.send_bulk_templated_email.call_count == 1:
+            raise FakeClientError()
+        return send(**kwargs)
+    client.send_bulk_templated_email.side_effect = fail_first
+
+    failed = await mail.send_bulk(recipients, "tmpl", {},
+        [{}] * len(recipients))
+
+    assert failed == recipients[:MAX_BULK_DESTINATIONS]
+    assert client.send_bulk_templated_email.call_count == 2
+
+async def test_send_bulk_status_mapping(mail, client):
+    """Per-destination statuses are mapped back to their recipients."""
+    recipients = make_recipients(MAX_BULK_DESTINATIONS + 5)
+    fail = {recipients[0], recipients[7], recipients[-1]}
+    client.send_bulk_templated_email.side_effect = \
+        new_fake_client(fail).send_bulk_templated_email.side_effect
+
+    failed = await mail.send_bulk(recipients, "tmpl", {},
+        [{}] * len(recipients))
+
+    assert failed == [r for r in recipients if r in fail]
+
+@pytest.mark.parametrize("n_data", [4, 6])
+async def test_send_bulk_length_mismatch(mail, client, n_data):
+    """Recipients and template data of different lengths are rejected."""
+    with pytest.raises(ValueError):
+        await mail.send_bulk(make_recipients(5), "tmpl", {}, [{}] * n_data)
+
+    client.send_bulk_templated_email.assert_not_called()
+
+async def test_send_email_single(mail, client):
+    """Lone queued email is sent without the bulk template."""
+    await mail.send_email("a@example.com", "subj", "body")
+
+    client.send_email.assert_called_once()
+    _, kwargs = client.send_email.call_args
+    assert kwargs["Destination"] == {"ToAddresses": ["a@example.com"]}
+    client.send_bulk_templated_email.assert_not_called()
+    client.create_template.assert_not_called()
+
+async def test_send_email_concurrent(mail, client):
+    """Concurrently queued emails are sent in one bulk request."""
+    recipients = make_recipients(5)
+
+    await gather(*(mail.send_email(r, f"subj {r}", f"body {r}")
+        for r in recipients))
+
+    client.send_bulk_templated_email.assert_called_once()
+    call = client.send_bulk_templated_email.call_args
+    assert bulk_recipients(call) == recipients
+    assert [loads(d["ReplacementTemplateData"])
+        for d in bulk_destinations(call)] \
+        == [{"subject": f"subj {r}", "body": f"body {r}"} for r in recipients]
+    client.send_email.assert_not_called()
+
+async def test_send_email_concurrent_one_fails(mail, client):
+    """Failure for one recipient raises only for that sender."""
+    recipients = make_recipients(5)
+    client.send_bulk_templated_email.side_effect = \
+        new_fake_client({recipients[2]}).send_bulk_templated_email.side_effect
+
+    results = await gather(*(mail.send_email(r, "subj", "body")
+        for r in recipients), return_exceptions=True)
+
+    assert isinstance(results[2], MailError)
+    assert results[2].recipient == recipients[2]
+    assert results[:2] + results[3:] == [None] * 4
+
+async def test_send_email_full_batch(mail, client):
+    """Full batch is flushed without waiting for the flush interval."""
+    recipients = make_recipients(MAX_BULK_DESTINATIONS)
+
+    with patch("iam.mail.FLUSH_INTERVAL", 60):
+        await wait_for(gather(*(mail.send_email(r, "subj", "body")
+            for r in recipients)), 5)
+
+    client.send_bulk_templated_email.assert_called_once()
+    assert bulk_recipients(client.send_bulk_templated_email.call_args) \
+        == recipients
+
+async def test_send_email_template_unavailable(mail, client):
+    """Emails are sent individually if the template cannot be set up."""
+    client.get_template.side_effect = FakeClientError()
+    client.create_template.side_effect = FakeClientError()
+    recipients = make_recipients(3)
+
+    await gather(*(mail.send_email(r, "subj", "body") for r in recipients))
+    await gather(*(mail.send_email(r, "subj", "body") for r in recipients))
+
+    assert client.send_email.call_count == 6
+    client.create_template.assert_called_once()
+    client.send_bulk_templated_email.assert_not_called()
+
+async def test_send_email_bulk_denied(mail, client):
+    """Emails are sent individually if bulk sends are not permitted."""
+    client.send_bulk_templated_email.side_effect = \
+        FakeClientError("AccessDenied")
+    recipients = make_recipients(3)
+
+    await gather(*(mail.send_email(r, "subj", "body") for r in recipients))
+    await gather(*(mail.send_email(r, "subj", "body") for r in recipients))
+
+    assert client.send_email.call_count == 6
+    client.send_bulk_templated_email.assert_called_once()
+
+async def test_send_email_bulk_throttled(mail, client):
+    """Throttled bulk request fails its emails but keeps batching on."""
+    send = client.send_bulk_templated_email.side_effect
+
+    def throttle_first(**kwargs):
+        if client.send_bulk_templated_email.call_count == 1:
+            raise FakeClientError("Throttling")
+        return send(**kwargs)
+    client.send_bulk_templated_email.side_effect = throttle_first
+    recipients = make_recipients(3)
+
+    first = await gather(*(mail.send_email(r, "subj", "body")
+        for r in recipients), return_exceptions=True)
+    await gather(*(mail.send_email(r, "subj", "body") for r in recipients))
+
+    assert [type(r) for r in first] == [MailError] * 3
+    assert client.send_bulk_templated_email.call_count == 2
+    client.send_email.assert_not_called()
+
+async def test_unload_fails_queued(mail, client):
+    """Emails still queued when the cog is unloaded raise MailError."""
+    with patch("iam.mail.FLUSH_INTERVAL", 60):
+        sends = gather(*(mail.send_email(r, "subj", "body")
+            for r in make_recipients(2)), return_exceptions=True)
+        await sleep(0)
+        mail.cog_unload()
+        results = await wait_for(sends, 1)
+
+    assert [type(r) for r in results] == [MailError, MailError]
+    client.send_email.assert_not_called()
+    client.send_bulk_templated_email.assert_not_called()
+
+async def test_unload_fails_flushing(mail, client):
+    """Emails being sent when the cog is unloaded raise MailError."""
+    started, release = Event(), Event()
+
+    def block(**kwargs):
+        started.set()
+        release.wait(5)
+        return {"MessageId": "id"}
+    client.send_email.side_effect = block
+
+    send = mail.send_email("a@example.com", "subj", "body")
+    sends = gather(send, return_exceptions=True)
+    while not started.is_set():
+        await sleep(0.01)
+    mail.cog_unload()
+    try:
+        results = await wait_for(sends, 1)
+    finally:
+        release.set()
+
+    assert type(results[0]) is MailError
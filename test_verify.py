@@ -1,23 +1,22 @@
 """Test the iam.verify module."""
 
 import pytest
-from time import time
-from unittest.mock import patch, AsyncMock, MagicMock
+from itertools import product
+from unittest.mock import patch, call, AsyncMock, MagicMock
 from discord import NotFound
 from iam.verify import (
     State, proc_begin, proc_restart, state_await_name, state_await_unsw,
     state_await_zid, state_await_email, proc_send_email, state_await_code,
     proc_resend_email, state_await_id, proc_forward_id_admins,
     proc_exec_approve, proc_exec_reject, proc_resend_id, proc_display_pending,
-    proc_verify_manual, proc_grant_rank
+    proc_verify_manual, proc_grant_rank, is_valid_zid
 )
 from iam.db import (
     MemberKey, MemberNotFound, make_def_member_data, MAX_VER_EMAILS
 )
 from iam.hooks import CheckFailed
-from iam.mail import MailError
-from iam.config import PREFIX, VERIF_ROLE
-import discord
+from iam.mail import MailError, is_valid_email
+from iam.config import PREFIX
 
 VALID_NAMES = ["Sabine Lim", "Test User", "kek", "", "X Æ A-12"]
 VALID_ZIDS = ["z5555555", "z1234567", "z0000000", "z5242579"]
@@ -28,62 +27,97 @@ VALID_EMAILS = [
 ]
 INVALID_EMAILS = ["a@a", "google.com", "email", "", "@gmail.com", "hi@"]
 SAMPLE_CODES = ["cf137a", "000000", "hello_world"]
+INVALID_CODES = ["wowee", "", "1nv4l1d", "!"]
+SAMPLE_ATTACH_COUNTS = [1, 2, 10]
 SAMPLE_REJECT_REASONS = ["photo unclear", "", "u suck", "invalid", "123456"]
+FROZEN_TIME = 1700000000.0
+EXPECTED_ID_MSG = ("{received} attachment(s) from {mention}. Please verify "
+    "that name on ID is `{full_name}`, then type `{prefix}verify approve "
+    "{uid}` or `{prefix}verify reject {uid} \"reason\"`.")
+
+ZID_EMAIL_PAIRS = tuple((z, f"{z}@student.unsw.edu.au") for z in VALID_ZIDS)
+CODE_UNSW_CASES = list(product(VALID_ZIDS, SAMPLE_CODES))
+INVALID_CODE_UNSW_CASES = list(product(VALID_ZIDS, SAMPLE_CODES,
+    INVALID_CODES))
+INVALID_CODE_NON_UNSW_CASES = list(product(SAMPLE_CODES, INVALID_CODES))
+EMAIL_VERIFIED_STATES = [State.AWAIT_ID, State.AWAIT_APPROVAL]
+RESTARTABLE_STATES = [s for s in State if s not in EMAIL_VERIFIED_STATES]
+FORWARD_ID_CASES = list(product(VALID_NAMES, SAMPLE_ATTACH_COUNTS))
+APPROVAL_CHECK_CASES = [
+    pytest.param({MemberKey.VER_STATE: state},
+        "That user is not awaiting approval.", id=f"not_awaiting-{state.name}")
+    for state in State if state != State.AWAIT_APPROVAL
+] + [
+    pytest.param({MemberKey.ID_VER: True, MemberKey.VER_STATE: state},
+        "That user is already verified.", id=f"verified-{state.name}")
+    for state in State
+] + [
+    pytest.param(None, "That user is not currently being verified.",
+        id="never_verifying")
+]
 
-def filter_dict(dict, except_keys):
-    return {k:v for k,v in dict.items() if k not in except_keys}
-
-def new_mock_user(id):
-    user = AsyncMock()
-    user.id = id
-    user.mention = f"@User_{user.id}#0000"
-    user.typing = MagicMock()
-    return user
-
-def new_mock_guild(id):
-    guild = AsyncMock()
-    guild.id = id
-    return guild
-
-def new_mock_channel(id):
-    channel = AsyncMock()
-    channel.id = id
-    channel.typing = MagicMock()
-    return channel
-
-def new_mock_message(id, attachments=[]):
-    message = AsyncMock()
-    message.id = id
-    message.attachments = attachments
-    return message
-
-def new_mock_attachment(id):
-    attachment = AsyncMock()
-    attachment.to_file.return_value = id
-    return attachment
-
-@pytest.mark.asyncio
-async def test_proc_begin_standard():
+VOLATILE_KEYS = frozenset([MemberKey.VER_TIME])
+DEF_MEMBER_ITEMS = tuple(make_def_member_data().items())
+
+def state_id(state):
+    return getattr(state, "name", str(state))
+
+def assert_matches_default(data, volatile=VOLATILE_KEYS):
+    assert len(data) == len(DEF_MEMBER_ITEMS)
+    for key, value in DEF_MEMBER_ITEMS:
+        if key not in volatile:
+            assert data[key] == value
+
+def assert_no_side_effects(*mocks):
+    for mock in mocks:
+        assert not mock.mock_calls, mock.mock_calls
+
+def reset_mocks(*mocks):
+    for mock in mocks:
+        mock.reset_mock()
+
+@pytest.fixture
+def frozen_time():
+    """Fix the time seen by iam.verify and iam.db, yielding that time."""
+    with patch("iam.verify.time", return_value=FROZEN_TIME), \
+        patch("iam.db.time", return_value=FROZEN_TIME):
+        yield FROZEN_TIME
+
+@pytest.fixture
+def mock_proc_send_email():
+    """Patch proc_send_email in iam.verify, yielding the mock."""
+    with patch("iam.verify.proc_send_email") as mock:
+        yield mock
+
+@pytest.fixture(scope="session")
+def _def_member_template():
+    """Default member data, generated once per session."""
+    return make_def_member_data()
+
+@pytest.fixture
+def member_data(_def_member_template):
+    """Copy of default member data for a single test to modify."""
+    return _def_member_template.copy()
+
+async def test_proc_begin_standard(mock_db, frozen_time, mock_member_factory,
+    mock_channel_factory, mock_message_factory):
     """User not undergoing verification can begin verification."""
     # Setup
-    invoke_message = new_mock_message(0)
-    db = MagicMock()
-    ver_channel = new_mock_channel(0)
-    member = new_mock_user(0)
-    db.get_member_data = MagicMock(side_effect=MemberNotFound(member.id, ""))
-    before_time = time()
+    invoke_message = mock_message_factory(0)
+    ver_channel = mock_channel_factory(0)
+    member = mock_member_factory(0)
+    mock_db.get_member_data = MagicMock(
+        side_effect=MemberNotFound(member.id, ""))
 
     # Call
-    await proc_begin(invoke_message, db, None, None, member)
+    await proc_begin(invoke_message, mock_db, None, None, member)
 
     # Ensure user entry in DB initialised with default data.
-    db.set_member_data.assert_called_once()
-    call_args = db.set_member_data.call_args.args
+    mock_db.set_member_data.assert_called_once()
+    call_args = mock_db.set_member_data.call_args.args
     assert call_args[0] == member.id
-    assert filter_dict(call_args[1], [MemberKey.VER_TIME]) == \
-        filter_dict(make_def_member_data(), [MemberKey.VER_TIME])
-    assert call_args[1][MemberKey.VER_TIME] >= before_time and \
-        call_args[1][MemberKey.VER_TIME] <= time()
+    assert_matches_default(call_args[1])
+    assert call_args[1][MemberKey.VER_TIME] == frozen_time
 
     # Ensure user was sent prompts.
     invoke_message.reply.assert_awaited_once_with("Please check your DMs for a "
@@ -93,199 +127,204 @@ async def test_proc_begin_standard():
         f"verification process at any time by typing `{PREFIX}restart`.")
 
     # Ensure user state updated to awaiting name.
-    db.update_member_data.assert_called_once_with(member.id,
+    mock_db.update_member_data.assert_called_once_with(member.id,
         {MemberKey.VER_STATE: State.AWAIT_NAME})
 
     # Ensure no side effects occurred.
-    member.add_roles.assert_not_awaited()
+    assert_no_side_effects(member.add_roles)
 
-@pytest.mark.asyncio
-async def test_proc_begin_already_verifying():
+@pytest.mark.parametrize("state", State, ids=state_id)
+async def test_proc_begin_already_verifying(state, mock_db, member_data,
+    mock_member_factory):
     """User already undergoing verification sent error."""
-    for state in State:
-        # Setup
-        db = MagicMock()
-        member = new_mock_user(0)
-        member_data = make_def_member_data()
-        member_data[MemberKey.VER_STATE] = state
-        db.get_member_data.return_value = member_data
-
-        # Call
-        await proc_begin(db, None, None, None, None, member)
+    # Setup
+    member = mock_member_factory(0)
+    member_data[MemberKey.VER_STATE] = state
+    mock_db.get_member_data.return_value = member_data
 
-        # Ensure correct user queried.
-        db.get_member_data.assert_called_once_with(member.id)
+    # Call
+    await proc_begin(mock_db, None, None, None, None, member)
 
-        # Ensure user was sent error.
-        member.send.assert_awaited_once_with("You are already undergoing the "
-            f"verification process. To restart, type `{PREFIX}restart`.")
+    # Ensure correct user queried.
+    mock_db.get_member_data.assert_called_once_with(member.id)
 
-        # Ensure no side effects occurred.
-        member.add_roles.assert_not_awaited()
-        db.set_member_data.assert_not_called()
-        db.update_member_data.assert_not_called()
+    # Ensure user was sent error.
+    member.send.assert_awaited_once_with("You are already undergoing the "
+        f"verification process. To restart, type `{PREFIX}restart`.")
 
-@pytest.mark.asyncio
-async def test_proc_begin_already_verified():
+    # Ensure no side effects occurred.
+    assert_no_side_effects(member.add_roles, mock_db.set_member_data,
+        mock_db.update_member_data)
+
+# Verified status is checked before state, so one value from either branch
+# of the state check is enough.
+@pytest.mark.parametrize("state", [State.AWAIT_NAME, None], ids=state_id)
+async def test_proc_begin_already_verified(state, mock_db, member_data,
+    mock_member_factory, mock_channel_factory):
     """User previously verified granted rank immediately."""
-    for state in State:
-        # Setup
-        db = MagicMock()
-        member = new_mock_user(0)
-        ver_role = AsyncMock()
-        admin_channel = new_mock_channel(1)
-        member_data = make_def_member_data()
-        member_data[MemberKey.ID_VER] = True
-        member_data[MemberKey.VER_STATE] = state
-        db.get_member_data.return_value = member_data
+    # Setup
+    member = mock_member_factory(0)
+    ver_role = AsyncMock()
+    admin_channel = mock_channel_factory(1)
+    member_data[MemberKey.ID_VER] = True
+    member_data[MemberKey.VER_STATE] = state
+    mock_db.get_member_data.return_value = member_data
 
-        # Call
-        await proc_begin(db, ver_role, None, admin_channel, member)
+    # Call
+    await proc_begin(mock_db, ver_role, None, admin_channel, member)
 
-        # Ensure correct user queried.
-        db.get_member_data.assert_called_once_with(member.id)
+    # Ensure correct user queried.
+    mock_db.get_member_data.assert_called_once_with(member.id)
 
-        # Ensure user was granted rank.
-        member.add_roles.assert_awaited_once_with(ver_role)
+    # Ensure user was granted rank.
+    member.add_roles.assert_awaited_once_with(ver_role)
 
-        # Ensure user was sent confirmation.
-        member.send.assert_awaited_once_with("Our records show you were "
-            "verified in the past. You have been granted the rank once again. "
-            "Welcome back to the server!")
+    # Ensure user was sent confirmation.
+    member.send.assert_awaited_once_with("Our records show you were "
+        "verified in the past. You have been granted the rank once again. "
+        "Welcome back to the server!")
 
-        # Ensure admin channel was sent confirmation.
-        admin_channel.send.assert_awaited_once_with(f"{member.mention} was "
-            "previously verified, and has been given the verified rank again "
-            "through request.")
+    # Ensure admin channel was sent confirmation.
+    admin_channel.send.assert_awaited_once_with(f"{member.mention} was "
+        "previously verified, and has been given the verified rank again "
+        "through request.")
 
-        # Ensure no side effects occurred.
-        db.set_member_data.assert_not_called()
-        db.update_member_data.assert_not_called()
+    # Ensure no side effects occurred.
+    assert_no_side_effects(mock_db.set_member_data, mock_db.update_member_data)
 
-@pytest.mark.asyncio
-async def test_proc_restart_standard():
+@pytest.mark.parametrize("state", RESTARTABLE_STATES, ids=state_id)
+async def test_proc_restart_standard(state, mock_db, member_data, frozen_time,
+    mock_member_factory):
     """User undergoing verification can restart verification."""
-    for state in State:
-        # Setup
-        db = MagicMock()
-        user = new_mock_user(0)
-        member_data = make_def_member_data()
-        member_data[MemberKey.VER_STATE] = state
-        db.get_member_data.return_value = member_data
-        before_time = time()
+    # Setup
+    user = mock_member_factory(0)
+    member_data[MemberKey.VER_STATE] = state
+    mock_db.get_member_data.return_value = member_data
 
-        # Call
-        await proc_restart(db, user)
-
-        # Ensure correct user queried.
-        db.get_member_data.assert_called_once_with(user.id)
-
-        # Ensure user entry in database updated correctly.
-        call_args_list = db.update_member_data.call_args_list
-        assert len(call_args_list) == 2
-        call_args = call_args_list[0].args
-        assert call_args[0] == user.id
-        assert filter_dict(call_args[1], [MemberKey.VER_TIME]) == \
-            {MemberKey.VER_STATE: None}
-        assert call_args[1][MemberKey.VER_TIME] >= before_time and \
-            call_args[1][MemberKey.VER_TIME] < time()
-
-        # Ensure user was sent prompt.
-        user.send.assert_awaited_once_with("What is your full name as it "
-            "appears on your government-issued ID?\nYou can restart this "
-            f"verification process at any time by typing `{PREFIX}restart`.")
-
-        # Ensure user state updated to awaiting name.
-        db.update_member_data.assert_called_with(user.id,
-            {MemberKey.VER_STATE: State.AWAIT_NAME})
+    # Call
+    await proc_restart(mock_db, user)
 
-        # Ensure no side effects occurred.
-        user.add_roles.assert_not_awaited()
-        db.set_member_data.assert_not_called()
+    # Ensure correct user queried.
+    mock_db.get_member_data.assert_called_once_with(user.id)
+
+    # Ensure user entry in database updated correctly.
+    call_args_list = mock_db.update_member_data.call_args_list
+    assert len(call_args_list) == 2
+    call_args = call_args_list[0].args
+    assert call_args == (user.id, {
+        MemberKey.VER_STATE: None,
+        MemberKey.VER_TIME: frozen_time
+    })
+
+    # Ensure user was sent prompt.
+    user.send.assert_awaited_once_with("What is your full name as it "
+        "appears on your government-issued ID?\nYou can restart this "
+        f"verification process at any time by typing `{PREFIX}restart`.")
+
+    # Ensure user state updated to awaiting name.
+    mock_db.update_member_data.assert_called_with(user.id,
+        {MemberKey.VER_STATE: State.AWAIT_NAME})
+
+    # Ensure no side effects occurred.
+    assert_no_side_effects(user.add_roles, mock_db.set_member_data)
 
-@pytest.mark.asyncio
-async def test_proc_restart_never_verifying():
+async def test_proc_restart_never_verifying(mock_db, mock_member_factory):
     """User never started verification sent error."""
     # Setup
-    db = MagicMock()
-    user = new_mock_user(0)
-    db.get_member_data = MagicMock(side_effect=MemberNotFound(user.id, ""))
+    user = mock_member_factory(0)
+    mock_db.get_member_data = MagicMock(
+        side_effect=MemberNotFound(user.id, ""))
 
     # Call
-    await proc_restart(db, user)
+    await proc_restart(mock_db, user)
 
     # Ensure correct user queried.
-    db.get_member_data.assert_called_once_with(user.id)
+    mock_db.get_member_data.assert_called_once_with(user.id)
 
     # Ensure user was sent error.
     user.send.assert_awaited_once_with("You are not currently being verified.")
 
     # Ensure no side effects occurred.
-    user.add_roles.assert_not_awaited()
-    db.set_member_data.assert_not_called()
-    db.update_member_data.assert_not_called()
+    assert_no_side_effects(user.add_roles, mock_db.set_member_data,
+        mock_db.update_member_data)
 
-@pytest.mark.asyncio
-async def test_proc_restart_not_verifying():
+async def test_proc_restart_not_verifying(mock_db, member_data,
+    mock_member_factory):
     """User not undergoing verification sent error."""
     # Setup
-    db = MagicMock()
-    user = new_mock_user(0)
-    db.get_member_data.return_value = make_def_member_data()
+    user = mock_member_factory(0)
+    mock_db.get_member_data.return_value = member_data
 
     # Call
-    await proc_restart(db, user)
+    await proc_restart(mock_db, user)
 
     # Ensure correct user queried.
-    db.get_member_data.assert_called_once_with(user.id)
+    mock_db.get_member_data.assert_called_once_with(user.id)
 
     # Ensure user was sent error.
     user.send.assert_awaited_once_with("You are not currently being verified.")
 
     # Ensure no side effects occurred.
-    user.add_roles.assert_not_awaited()
-    db.set_member_data.assert_not_called()
-    db.update_member_data.assert_not_called()
+    assert_no_side_effects(user.add_roles, mock_db.set_member_data,
+        mock_db.update_member_data)
+
+@pytest.mark.parametrize("state", EMAIL_VERIFIED_STATES, ids=state_id)
+async def test_proc_restart_email_verified(state, mock_db, member_data,
+    mock_member_factory):
+    """User who has verified their email cannot restart."""
+    # Setup
+    user = mock_member_factory(0)
+    member_data[MemberKey.VER_STATE] = state
+    mock_db.get_member_data.return_value = member_data
+
+    # Call
+    await proc_restart(mock_db, user)
 
-@pytest.mark.asyncio
-async def test_proc_restart_already_verified():
+    # Ensure correct user queried.
+    mock_db.get_member_data.assert_called_once_with(user.id)
+
+    # Ensure user was sent error.
+    user.send.assert_awaited_once_with("You cannot restart after verifying "
+        "your email!")
+
+    # Ensure no side effects occurred.
+    assert_no_side_effects(user.add_roles, mock_db.set_member_data,
+        mock_db.update_member_data)
+
+@pytest.mark.parametrize("state", [State.AWAIT_NAME, None], ids=state_id)
+async def test_proc_restart_already_verified(state, mock_db, member_data,
+    mock_member_factory):
     """User already verified sent error."""
-    for state in State:
-        # Setup
-        db = MagicMock()
-        user = new_mock_user(0)
-        member_data = make_def_member_data()
-        member_data[MemberKey.ID_VER] = True
-        member_data[MemberKey.VER_STATE] = state
-        db.get_member_data.return_value = member_data
+    # Setup
+    user = mock_member_factory(0)
+    member_data[MemberKey.ID_VER] = True
+    member_data[MemberKey.VER_STATE] = state
+    mock_db.get_member_data.return_value = member_data
 
-        # Call
-        await proc_restart(db, user)
+    # Call
+    await proc_restart(mock_db, user)
 
-        # Ensure correct user queried.
-        db.get_member_data.assert_called_once_with(user.id)
+    # Ensure correct user queried.
+    mock_db.get_member_data.assert_called_once_with(user.id)
 
-        # Ensure user was sent error.
-        user.send.assert_awaited_once_with("You are already verified.")
+    # Ensure user was sent error.
+    user.send.assert_awaited_once_with("You are already verified.")
 
-        # Ensure no side effects occurred.
-        user.add_roles.assert_not_awaited()
-        db.set_member_data.assert_not_called()
-        db.update_member_data.assert_not_called()
+    # Ensure no side effects occurred.
+    assert_no_side_effects(user.add_roles, mock_db.set_member_data,
+        mock_db.update_member_data)
 
-@pytest.mark.asyncio
-async def test_state_await_name_standard():
+async def test_state_await_name_standard(mock_db, mock_member_factory):
     """User sending valid name moves on to UNSW student question."""
     # Setup
-    db = MagicMock()
-    member = new_mock_user(0)
+    member = mock_member_factory(0)
     full_name = "Test User 0"
 
     # Call
-    await state_await_name(db, member, full_name)
+    await state_await_name(mock_db, member, full_name)
 
     # Ensure user entry in database updated correctly.
-    call_args_list = db.update_member_data.call_args_list
+    call_args_list = mock_db.update_member_data.call_args_list
     assert len(call_args_list) == 2
     call_args = call_args_list[0].args
     assert call_args == (member.id, {MemberKey.NAME: full_name})
@@ -299,532 +338,482 @@ async def test_state_await_name_standard():
     assert call_args == (member.id, {MemberKey.VER_STATE: State.AWAIT_UNSW})
 
     # Ensure no side effects occurred.
-    member.add_roles.assert_not_awaited()
-    db.set_member_data.assert_not_called()
+    assert_no_side_effects(member.add_roles, mock_db.set_member_data)
 
-@pytest.mark.asyncio
-async def test_state_await_name_too_long():
+async def test_state_await_name_too_long(mock_db, mock_member_factory):
     """User sending name that is too long sent error."""
     # Setup
-    db = MagicMock()
-    member = new_mock_user(0)
+    member = mock_member_factory(0)
     full_name = "a" * 501
 
     # Call
-    await state_await_name(db, member, full_name)
+    await state_await_name(mock_db, member, full_name)
 
     # Ensure user was sent error.
     member.send.assert_awaited_once_with(f"Name must be 500 characters or "
         "fewer. Please try again.")
 
     # Ensure no side effects occurred.
-    member.add_roles.assert_not_awaited()
-    db.set_member_data.assert_not_called()
-    db.update_member_data.assert_not_called()
+    assert_no_side_effects(member.add_roles, mock_db.set_member_data,
+        mock_db.update_member_data)
 
-@pytest.mark.asyncio
-async def test_state_await_unsw_yes():
+@pytest.mark.parametrize("ans", ["y", "Y", "yes", "Yes", "YES"])
+async def test_state_await_unsw_yes(ans, mock_db, mock_member_factory):
     """User answering yes moves on to zID question."""
-    for ans in ["y", "Y", "yes", "Yes", "YES"]:
-        # Setup
-        db = MagicMock()
-        member = new_mock_user(0)
+    # Setup
+    member = mock_member_factory(0)
 
-        # Call
-        await state_await_unsw(db, member, ans)
+    # Call
+    await state_await_unsw(mock_db, member, ans)
 
-        # Ensure user was sent prompt.
-        member.send.awaited_once_with("What is your zID?")
+    # Ensure user was sent prompt.
+    member.send.assert_awaited_once_with("What is your zID?")
 
-        # Ensure user state updated to awaiting zID.
-        db.update_member_data.assert_called_once_with(member.id,
-            {MemberKey.VER_STATE: State.AWAIT_ZID})
+    # Ensure user state updated to awaiting zID.
+    mock_db.update_member_data.assert_called_once_with(member.id,
+        {MemberKey.VER_STATE: State.AWAIT_ZID})
 
-        # Ensure no side effects occurred.
-        member.add_roles.assert_not_awaited()
-        db.set_member_data.assert_not_called()
+    # Ensure no side effects occurred.
+    assert_no_side_effects(member.add_roles, mock_db.set_member_data)
 
-@pytest.mark.asyncio
-async def test_state_await_unsw_no():
+@pytest.mark.parametrize("ans", ["n", "N", "no", "No", "NO"])
+async def test_state_await_unsw_no(ans, mock_db, mock_member_factory):
     """User answering no moves on to email question."""
-    for ans in ["n", "N", "no", "No", "NO"]:
-        # Setup
-        db = MagicMock()
-        member = new_mock_user(0)
+    # Setup
+    member = mock_member_factory(0)
 
-        # Call
-        await state_await_unsw(db, member, ans)
+    # Call
+    await state_await_unsw(mock_db, member, ans)
 
-        # Ensure user was sent prompt.
-        member.send.awaited_once_with("What is your email address?")
+    # Ensure user was sent prompt.
+    member.send.assert_awaited_once_with("What is your email address?")
 
-        # Ensure user state updated to awaiting email.
-        db.update_member_data.assert_called_once_with(member.id,
-            {MemberKey.VER_STATE: State.AWAIT_EMAIL})
+    # Ensure user state updated to awaiting email.
+    mock_db.update_member_data.assert_called_once_with(member.id,
+        {MemberKey.VER_STATE: State.AWAIT_EMAIL})
 
-        # Ensure no side effects occurred.
-        member.add_roles.assert_not_awaited()
-        db.set_member_data.assert_not_called()
+    # Ensure no side effects occurred.
+    assert_no_side_effects(member.add_roles, mock_db.set_member_data)
 
-@pytest.mark.asyncio
-async def test_state_await_unsw_unrecognised():
+async def test_state_await_unsw_unrecognised(mock_db, mock_member_factory):
     """User typing unrecognised response sent error."""
     # Setup
-    db = MagicMock()
-    member = new_mock_user(0)
+    member = mock_member_factory(0)
     ans = "kek"
 
     # Call
-    await state_await_unsw(db, member, ans)
+    await state_await_unsw(mock_db, member, ans)
 
     # Ensure user was sent error.
     member.send.assert_awaited_once_with("Please type `y` or `n`.")
 
     # Ensure no side effects occurred.
-    member.add_roles.assert_not_awaited()
-    db.set_member_data.assert_not_called()
-    db.update_member_data.assert_not_called()
-
-@pytest.mark.asyncio
-async def test_state_await_zid_standard():
+    assert_no_side_effects(member.add_roles, mock_db.set_member_data,
+        mock_db.update_member_data)
+
+@pytest.mark.parametrize("zid", VALID_ZIDS)
+def test_is_valid_zid_valid(zid):
+    """Strings in zID format accepted."""
+    assert is_valid_zid(zid)
+
+@pytest.mark.parametrize("zid", INVALID_ZIDS)
+def test_is_valid_zid_invalid(zid):
+    """Strings not in zID format rejected."""
+    assert not is_valid_zid(zid)
+
+@pytest.mark.parametrize("email", VALID_EMAILS)
+def test_is_valid_email_valid(email):
+    """Well-formed emails accepted."""
+    assert is_valid_email(email)
+
+@pytest.mark.parametrize("email", INVALID_EMAILS)
+def test_is_valid_email_invalid(email):
+    """Malformed emails rejected."""
+    assert not is_valid_email(email)
+
+@pytest.mark.parametrize("zid,email", ZID_EMAIL_PAIRS,
+    ids=[zid for zid, _ in ZID_EMAIL_PAIRS])
+async def test_state_await_zid_standard(zid, email, mock_db, member_data,
+    mock_proc_send_email, mock_member_factory):
     """User sending valid zID moves on to proc_send_email."""
-    for zid in VALID_ZIDS:
-        # Setup
-        db = MagicMock()
-        mail = MagicMock()
-        member = new_mock_user(0)
-        member_data = make_def_member_data()
-        email = f"{zid}@student.unsw.edu.au"
+    # Setup
+    mail = MagicMock()
+    member = mock_member_factory(0)
 
-        # Call
-        with patch("iam.verify.proc_send_email") as mock_proc_send_email:
-            await state_await_zid(db, mail, member, member_data, zid)
+    # Call
+    await state_await_zid(mock_db, mail, member, member_data, zid)
 
-        # Ensure user entry in database updated accordingly.
-        db.update_member_data.assert_called_once_with(member.id, {
-            MemberKey.ZID: zid,
-            MemberKey.EMAIL: email
-        })
+    # Ensure user entry in database updated accordingly.
+    mock_db.update_member_data.assert_called_once_with(member.id, {
+        MemberKey.ZID: zid,
+        MemberKey.EMAIL: email
+    })
 
-        # Ensure proc_send_email called.
-        mock_proc_send_email.assert_awaited_once_with(db, mail, member, 
-            member_data, email)
+    # Ensure proc_send_email called.
+    mock_proc_send_email.assert_awaited_once_with(mock_db, mail, member, 
+        member_data, email)
 
-        # Ensure no side effects occurred.
-        member.send.assert_not_awaited()
-        member.add_roles.assert_not_awaited()
-        db.set_member_data.assert_not_called()
+    # Ensure no side effects occurred.
+    assert_no_side_effects(member.send, member.add_roles,
+        mock_db.set_member_data)
 
-@pytest.mark.asyncio
-async def test_state_await_zid_invalid():
+async def test_state_await_zid_invalid(mock_db, member_data,
+    mock_proc_send_email, mock_member_factory):
     """User sending invalid zID sent error."""
-    for zid in INVALID_ZIDS:
-        # Setup
-        db = MagicMock()
-        mail = MagicMock()
-        member = new_mock_user(0)
-        member_data = make_def_member_data()
-        email = f"{zid}@student.unsw.edu.au"
+    # Setup
+    zid = INVALID_ZIDS[0]
+    mail = MagicMock()
+    member = mock_member_factory(0)
 
-        # Call
-        with patch("iam.verify.proc_send_email") as mock_proc_send_email:
-            await state_await_zid(db, mail, member, member_data, zid)
+    # Call
+    await state_await_zid(mock_db, mail, member, member_data, zid)
 
-        # Ensure user was sent error.
-        member.send.assert_awaited_once_with("Your zID must match the "
-            "following format: `zXXXXXXX`. Please try again")
+    # Ensure user was sent error.
+    member.send.assert_awaited_once_with("Your zID must match the "
+        "following format: `zXXXXXXX`. Please try again")
 
-        # Ensure no side effects occurred.
-        mock_proc_send_email.assert_not_called()
-        member.add_roles.assert_not_awaited()
-        db.set_member_data.assert_not_called()
-        db.update_member_data.assert_not_called()
+    # Ensure no side effects occurred.
+    assert_no_side_effects(mock_proc_send_email, member.add_roles,
+        mock_db.set_member_data, mock_db.update_member_data)
 
-@pytest.mark.asyncio
-async def test_state_await_email_standard():
+@pytest.mark.parametrize("email", VALID_EMAILS)
+async def test_state_await_email_standard(email, mock_db, member_data,
+    mock_proc_send_email, mock_member_factory):
     """User sending valid email moves on to proc_send_email."""
-    for email in VALID_EMAILS:
-        # Setup
-        db = MagicMock()
-        mail = MagicMock()
-        member = new_mock_user(0)
-        member_data = make_def_member_data()
+    # Setup
+    mail = MagicMock()
+    member = mock_member_factory(0)
 
-        # Call
-        with patch("iam.verify.proc_send_email") as mock_proc_send_email:
-            await state_await_email(db, mail, member, member_data, email)
+    # Call
+    await state_await_email(mock_db, mail, member, member_data, email)
 
-        # Ensure user entry in database updated accordingly.
-        db.update_member_data.assert_called_once_with(member.id, {
-            MemberKey.EMAIL: email
-        })
+    # Ensure user entry in database updated accordingly.
+    mock_db.update_member_data.assert_called_once_with(member.id, {
+        MemberKey.EMAIL: email
+    })
 
-        # Ensure proc_send_email called.
-        mock_proc_send_email.assert_awaited_once_with(db, mail, member, 
-            member_data, email)
+    # Ensure proc_send_email called.
+    mock_proc_send_email.assert_awaited_once_with(mock_db, mail, member, 
+        member_data, email)
 
-        # Ensure no side effects occurred.
-        member.send.assert_not_awaited()
-        member.add_roles.assert_not_awaited()
-        db.set_member_data.assert_not_called()
+    # Ensure no side effects occurred.
+    assert_no_side_effects(member.send, member.add_roles,
+        mock_db.set_member_data)
 
-@pytest.mark.asyncio
-async def test_state_await_email_invalid():
+async def test_state_await_email_invalid(mock_db, member_data,
+    mock_proc_send_email, mock_member_factory):
     """User sending invalid email sent error."""
-    for email in INVALID_EMAILS:
-        # Setup
-        db = MagicMock()
-        mail = MagicMock()
-        member = new_mock_user(0)
-        member_data = make_def_member_data()
+    # Setup
+    email = INVALID_EMAILS[0]
+    mail = MagicMock()
+    member = mock_member_factory(0)
 
-        # Call
-        with patch("iam.verify.proc_send_email") as mock_proc_send_email:
-            await state_await_email(db, mail, member, member_data, email)
+    # Call
+    await state_await_email(mock_db, mail, member, member_data, email)
 
-        # Ensure user was sent error.
-        member.send.assert_awaited_once_with("That is not a valid email "
-            "address. Please try again.")
+    # Ensure user was sent error.
+    member.send.assert_awaited_once_with("That is not a valid email "
+        "address. Please try again.")
 
-        # Ensure no side effects occurred.
-        mock_proc_send_email.assert_not_called()
-        member.add_roles.assert_not_awaited()
-        db.set_member_data.assert_not_called()
-        db.update_member_data.assert_not_called()
+    # Ensure no side effects occurred.
+    assert_no_side_effects(mock_proc_send_email, member.add_roles,
+        mock_db.set_member_data, mock_db.update_member_data)
 
-@pytest.mark.asyncio
-async def test_proc_send_email_standard():
+@pytest.mark.parametrize("email", VALID_EMAILS)
+async def test_proc_send_email_standard(email, mock_db, member_data,
+    mock_member_factory):
     """User sent email moves on to code question."""
-    for email in VALID_EMAILS:
-        # Setup
-        db = MagicMock()
-        mail = MagicMock()
-        member = new_mock_user(0)
-        member_data = make_def_member_data()
-        code = "cf137a"
+    # Setup
+    mail = MagicMock()
+    mail.send_email = AsyncMock()
+    member = mock_member_factory(0)
+    code = "cf137a"
 
-        # Call
-        with patch("iam.verify.get_code") as mock_get_code:
-            mock_get_code.return_value = code
-            await proc_send_email(db, mail, member, member_data, email)
+    # Call
+    with patch("iam.verify.get_code") as mock_get_code:
+        mock_get_code.return_value = code
+        await proc_send_email(mock_db, mail, member, member_data, email)
 
-        # Ensure user was sent email.
-        mail.send_email.assert_called_once_with(email, 
-            "PCSoc Discord Verification", f"Your code is {code}")
+    # Ensure user was sent email.
+    mail.send_email.assert_awaited_once_with(email, 
+        "PCSoc Discord Verification", f"Your code is {code}")
 
-        # Ensure user entry in database updated accordingly.
-        call_args_list = db.update_member_data.call_args_list
-        assert len(call_args_list) == 2
-        call_args = call_args_list[0].args
-        assert call_args == (member.id, {
-            MemberKey.EMAIL_ATTEMPTS: member_data[MemberKey.EMAIL_ATTEMPTS] + 1
-        })
+    # Ensure user entry in database updated accordingly.
+    call_args_list = mock_db.update_member_data.call_args_list
+    assert len(call_args_list) == 2
+    call_args = call_args_list[0].args
+    assert call_args == (member.id, {
+        MemberKey.EMAIL_ATTEMPTS: member_data[MemberKey.EMAIL_ATTEMPTS] + 1
+    })
 
-        # Ensure user was sent prompt.
-        member.send.assert_awaited_once_with("Please enter the code sent to "
-            "your email (check your spam folder if you don't see it).\n"
-            f"You can request another email by typing `{PREFIX}resend`.")
+    # Ensure user was sent prompt.
+    member.send.assert_awaited_once_with("Please enter the code sent to "
+        "your email (check your spam folder if you don't see it).\n"
+        f"You can request another email by typing `{PREFIX}resend`.")
 
-        # Ensure user state updated to awaiting code.
-        call_args = call_args_list[1].args
-        assert call_args == (member.id, {
-            MemberKey.VER_STATE: State.AWAIT_CODE
-        })
+    # Ensure user state updated to awaiting code.
+    call_args = call_args_list[1].args
+    assert call_args == (member.id, {
+        MemberKey.VER_STATE: State.AWAIT_CODE
+    })
 
-        # Ensure no side effects occurred.
-        member.add_roles.assert_not_awaited()
-        db.set_member_data.assert_not_called()
+    # Ensure no side effects occurred.
+    assert_no_side_effects(member.add_roles, mock_db.set_member_data)
 
-@pytest.mark.asyncio
-async def test_proc_send_email_out_of_attempts():
+@pytest.mark.parametrize("email", VALID_EMAILS)
+async def test_proc_send_email_out_of_attempts(email, mock_db, member_data,
+    mock_member_factory):
     """User who was sent too many emails previously sent error."""
-    for email in VALID_EMAILS:
-        # Setup
-        db = MagicMock()
-        mail = MagicMock()
-        member = new_mock_user(0)
-        member_data = make_def_member_data()
-        member_data[MemberKey.EMAIL_ATTEMPTS] = MAX_VER_EMAILS
+    # Setup
+    mail = MagicMock()
+    member = mock_member_factory(0)
+    member_data[MemberKey.EMAIL_ATTEMPTS] = MAX_VER_EMAILS
 
-        # Call
-        await proc_send_email(db, mail, member, member_data, email)
+    # Call
+    await proc_send_email(mock_db, mail, member, member_data, email)
 
-        # Ensure user was sent error.
-        member.send.assert_awaited_once_with("You have requested too many "
-            "emails. Please DM an exec to continue verification.")
+    # Ensure user was sent error.
+    member.send.assert_awaited_once_with("You have requested too many "
+        "emails. Please DM an exec to continue verification.")
 
-        # Ensure user not sent email.
-        mail.send_email.assert_not_called()
+    # Ensure user not sent email.
+    mail.send_email.assert_not_called()
 
-        # Ensure no side effects occurred.
-        member.add_roles.assert_not_awaited()
-        db.set_member_data.assert_not_called()
-        db.update_member_data.assert_not_called()
+    # Ensure no side effects occurred.
+    assert_no_side_effects(member.add_roles, mock_db.set_member_data,
+        mock_db.update_member_data)
 
-@pytest.mark.asyncio
-async def test_proc_send_email_failed():
+@pytest.mark.parametrize("email", VALID_EMAILS)
+async def test_proc_send_email_failed(email, mock_db, member_data,
+    mock_member_factory):
     """When email bounces, user sent error without using up an attempt."""
-    for email in VALID_EMAILS:
-        # Setup
-        db = MagicMock()
-        mail = MagicMock()
-        mail.send_email = MagicMock(side_effect=MailError(email))
-        member = new_mock_user(0)
-        member_data = make_def_member_data()
-        code = "cf137a"
+    # Setup
+    mail = MagicMock()
+    mail.send_email = AsyncMock(side_effect=MailError(email))
+    member = mock_member_factory(0)
+    code = "cf137a"
 
-        # Call
-        with patch("iam.verify.get_code") as mock_get_code:
-            mock_get_code.return_value = code
-            await proc_send_email(db, mail, member, member_data, email)
+    # Call
+    with patch("iam.verify.get_code") as mock_get_code:
+        mock_get_code.return_value = code
+        await proc_send_email(mock_db, mail, member, member_data, email)
 
-        # Ensure email sending attempted.
-        mail.send_email.assert_called_once_with(email, 
-            "PCSoc Discord Verification", f"Your code is {code}")
+    # Ensure email sending attempted.
+    mail.send_email.assert_awaited_once_with(email, 
+        "PCSoc Discord Verification", f"Your code is {code}")
 
-        # Ensure user was sent error.
-        member.send.assert_awaited_once_with("Oops! Something went wrong "
-            "while attempting to send you an email. Please ensure that your "
-            "details have been entered correctly.")
+    # Ensure user was sent error.
+    member.send.assert_awaited_once_with("Oops! Something went wrong "
+        "while attempting to send you an email. Please ensure that your "
+        "details have been entered correctly.")
 
-        # Ensure no side effects occurred.
-        member.add_roles.assert_not_awaited()
-        db.set_member_data.assert_not_called()
-        db.update_member_data.assert_not_called()
+    # Ensure no side effects occurred.
+    assert_no_side_effects(member.add_roles, mock_db.set_member_data,
+        mock_db.update_member_data)
 
-@pytest.mark.asyncio
-async def test_state_await_code_unsw():
+@pytest.mark.parametrize("zid,code", CODE_UNSW_CASES)
+async def test_state_await_code_unsw(zid, code, mock_db, member_data,
+    frozen_time, mock_member_factory, mock_channel_factory):
     """Student sending matching code verified."""
-    for zid in VALID_ZIDS:
-        for code in SAMPLE_CODES:
-            # Setup
-            db = MagicMock()
-            ver_role = AsyncMock()
-            member = new_mock_user(0)
-            admin_channel = new_mock_channel(1)
-            member_data = make_def_member_data()
-            member_data[MemberKey.ZID] = zid
-            before_time = time()
+    # Setup
+    ver_role = AsyncMock()
+    member = mock_member_factory(0)
+    admin_channel = mock_channel_factory(1)
+    join_announce_channel = mock_channel_factory(3)
+    member_data[MemberKey.ZID] = zid
 
-            # Call
-            with patch("iam.verify.get_code") as mock_get_code:
-                mock_get_code.return_value = code
-                with patch("iam.verify.proc_grant_rank") as \
-                    mock_proc_grant_rank:
-                    await state_await_code(db, ver_role, admin_channel, member,
-                        member_data, code)
-
-            # Ensure user entry in DB updated correctly.
-            call_args_list = db.update_member_data.call_args_list
-            assert len(call_args_list) == 2
-            call_args = call_args_list[0].args
-            assert call_args[0] == member.id
-            assert filter_dict(call_args[1], [MemberKey.VER_TIME]) == \
-                {MemberKey.EMAIL_VER: True}
-            assert call_args[1][MemberKey.VER_TIME] >= before_time and \
-                call_args[1][MemberKey.VER_TIME] <= time()
-            call_args = call_args_list[1].args
-            assert call_args == (member.id, {MemberKey.ID_VER: True})
+    # Call
+    with patch("iam.verify.get_code") as mock_get_code:
+        mock_get_code.return_value = code
+        with patch("iam.verify.proc_grant_rank") as \
+            mock_proc_grant_rank:
+            await state_await_code(mock_db, ver_role, admin_channel,
+                join_announce_channel, member, member_data, code)
+
+    # Ensure user entry in DB updated correctly.
+    call_args_list = mock_db.update_member_data.call_args_list
+    assert len(call_args_list) == 2
+    call_args = call_args_list[0].args
+    assert call_args == (member.id, {
+        MemberKey.EMAIL_VER: True,
+        MemberKey.VER_TIME: frozen_time
+    })
+    call_args = call_args_list[1].args
+    assert call_args == (member.id, {MemberKey.ID_VER: True})
 
-            # Ensure user granted rank.
-            mock_proc_grant_rank.assert_awaited_once()
+    # Ensure user granted rank.
+    mock_proc_grant_rank.assert_awaited_once_with(ver_role, admin_channel,
+        join_announce_channel, member)
 
-            # Ensure no side effects occurred.
-            member.send.assert_not_awaited()
-            member.add_roles.assert_not_called()
-            db.set_member_data.assert_not_called()
+    # Ensure no side effects occurred.
+    assert_no_side_effects(member.send, member.add_roles,
+        mock_db.set_member_data)
 
-@pytest.mark.asyncio
-async def test_state_await_code_non_unsw():
+@pytest.mark.parametrize("code", SAMPLE_CODES)
+async def test_state_await_code_non_unsw(code, mock_db, member_data,
+    frozen_time, mock_member_factory, mock_channel_factory):
     """Non-student sending matching code moves on to ID question."""
-    """Student sending matching code verified."""
-    for code in SAMPLE_CODES:
-        # Setup
-        db = MagicMock()
-        ver_role = AsyncMock()
-        member = new_mock_user(0)
-        admin_channel = new_mock_channel(1)
-        member_data = make_def_member_data()
-        before_time = time()
+    # Setup
+    ver_role = AsyncMock()
+    member = mock_member_factory(0)
+    admin_channel = mock_channel_factory(1)
+    join_announce_channel = mock_channel_factory(3)
 
-        # Call
-        with patch("iam.verify.get_code") as mock_get_code:
-            mock_get_code.return_value = code
-            await state_await_code(db, ver_role, admin_channel, member,
-                member_data, code)
-
-        # Ensure user entry in DB updated correctly.
-        call_args_list = db.update_member_data.call_args_list
-        assert len(call_args_list) == 2
-        call_args = call_args_list[0].args
-        assert call_args[0] == member.id
-        assert filter_dict(call_args[1], [MemberKey.VER_TIME]) == \
-            {MemberKey.EMAIL_VER: True}
-        assert call_args[1][MemberKey.VER_TIME] >= before_time and \
-            call_args[1][MemberKey.VER_TIME] <= time()
-
-        # Ensure user was sent prompt.
-        assert member.send.awaited_once_with("Please send a message with "
-            "a photo of your government-issued ID attached.")
-
-        # Ensure user state updated to awaiting ID.
-        call_args = call_args_list[1].args
-        assert call_args == (member.id,
-            {MemberKey.VER_STATE: State.AWAIT_ID})
+    # Call
+    with patch("iam.verify.get_code") as mock_get_code:
+        mock_get_code.return_value = code
+        await state_await_code(mock_db, ver_role, admin_channel,
+            join_announce_channel, member, member_data, code)
 
-        # Ensure no side effects occurred.
-        member.add_roles.assert_not_called()
-        db.set_member_data.assert_not_called()
+    # Ensure user entry in DB updated correctly.
+    call_args_list = mock_db.update_member_data.call_args_list
+    assert len(call_args_list) == 2
+    call_args = call_args_list[0].args
+    assert call_args == (member.id, {
+        MemberKey.EMAIL_VER: True,
+        MemberKey.VER_TIME: frozen_time
+    })
+
+    # Ensure user was sent prompt.
+    member.send.assert_awaited_once_with("Please send a message with "
+        "a photo of your government-issued ID attached.")
+
+    # Ensure user state updated to awaiting ID.
+    call_args = call_args_list[1].args
+    assert call_args == (member.id,
+        {MemberKey.VER_STATE: State.AWAIT_ID})
 
-@pytest.mark.asyncio
-async def test_state_await_code_invalid_unsw():
+    # Ensure no side effects occurred.
+    assert_no_side_effects(member.add_roles, mock_db.set_member_data)
+
+@pytest.mark.parametrize("zid,expected_code,received_code",
+    INVALID_CODE_UNSW_CASES)
+async def test_state_await_code_invalid_unsw(zid, expected_code, received_code,
+    mock_db, member_data, mock_member_factory, mock_channel_factory):
     """Student sending non-matching code sent error."""
-    for zid in VALID_ZIDS:
-        for expected_code in SAMPLE_CODES:
-            for received_code in ["wowee", "", "1nv4l1d", "!"]:
-                # Setup
-                db = MagicMock()
-                ver_role = AsyncMock()
-                member = new_mock_user(0)
-                admin_channel = new_mock_channel(1)
-                member_data = make_def_member_data()
-                member_data[MemberKey.ZID] = zid
-                before_time = time()
-
-                # Call
-                with patch("iam.verify.get_code") as mock_get_code:
-                    mock_get_code.return_value = expected_code
-                    await state_await_code(db, ver_role, admin_channel, member,
-                        member_data, received_code)
-
-                # Ensure user was sent error.    
-                member.send.assert_awaited_once_with("That was not the "
-                    "correct code. Please try again.\nYou can request another "
-                    f"email by typing `{PREFIX}resend`.")
-
-                # Ensure no side effects occurred.
-                member.add_roles.assert_not_called()
-                db.set_member_data.assert_not_called()
-
-@pytest.mark.asyncio
-async def test_state_await_code_invalid_non_unsw():
+    # Setup
+    ver_role = AsyncMock()
+    member = mock_member_factory(0)
+    admin_channel = mock_channel_factory(1)
+    join_announce_channel = mock_channel_factory(3)
+    member_data[MemberKey.ZID] = zid
+
+    # Call
+    with patch("iam.verify.get_code") as mock_get_code:
+        mock_get_code.return_value = expected_code
+        await state_await_code(mock_db, ver_role, admin_channel,
+            join_announce_channel, member, member_data, received_code)
+
+    # Ensure user was sent error.    
+    member.send.assert_awaited_once_with("That was not the "
+        "correct code. Please try again.\nYou can request another "
+        f"email by typing `{PREFIX}resend`.")
+
+    # Ensure no side effects occurred.
+    assert_no_side_effects(member.add_roles, mock_db.set_member_data)
+
+@pytest.mark.parametrize("expected_code,received_code",
+    INVALID_CODE_NON_UNSW_CASES)
+async def test_state_await_code_invalid_non_unsw(expected_code, received_code,
+    mock_db, member_data, mock_member_factory, mock_channel_factory):
     """Non-student sending non-matching code sent error."""
-    for expected_code in SAMPLE_CODES:
-        for received_code in ["wowee", "", "1nv4l1d", "!"]:
-            # Setup
-            db = MagicMock()
-            ver_role = AsyncMock()
-            member = new_mock_user(0)
-            admin_channel = new_mock_channel(1)
-            member_data = make_def_member_data()
-            before_time = time()
+    # Setup
+    ver_role = AsyncMock()
+    member = mock_member_factory(0)
+    admin_channel = mock_channel_factory(1)
+    join_announce_channel = mock_channel_factory(3)
 
-            # Call
-            with patch("iam.verify.get_code") as mock_get_code:
-                mock_get_code.return_value = expected_code
-                await state_await_code(db, ver_role, admin_channel, member,
-                    member_data, received_code)
+    # Call
+    with patch("iam.verify.get_code") as mock_get_code:
+        mock_get_code.return_value = expected_code
+        await state_await_code(mock_db, ver_role, admin_channel,
+            join_announce_channel, member, member_data, received_code)
 
-            # Ensure user was sent error.    
-            member.send.assert_awaited_once_with("That was not the "
-                "correct code. Please try again.\nYou can request another "
-                f"email by typing `{PREFIX}resend`.")
+    # Ensure user was sent error.    
+    member.send.assert_awaited_once_with("That was not the "
+        "correct code. Please try again.\nYou can request another "
+        f"email by typing `{PREFIX}resend`.")
 
-            # Ensure no side effects occurred.
-            member.add_roles.assert_not_called()
-            db.set_member_data.assert_not_called()
+    # Ensure no side effects occurred.
+    assert_no_side_effects(member.add_roles, mock_db.set_member_data)
 
-@pytest.mark.asyncio
-async def test_proc_resend_email_standard():
+@pytest.mark.parametrize("email", VALID_EMAILS)
+async def test_proc_resend_email_standard(email, mock_db, member_data,
+    mock_proc_send_email, mock_member_factory):
     """User requesting resend sent another email."""
-    for email in VALID_EMAILS:
-        # Setup
-        db = MagicMock()
-        mail = MagicMock()
-        member = new_mock_user(0)
-        member_data = make_def_member_data()
-        member_data[MemberKey.EMAIL] = email
-        member_data[MemberKey.VER_STATE] = State.AWAIT_CODE
-
-        # Call
-        with patch("iam.verify.proc_send_email") as mock_proc_send_email:
-            await proc_resend_email(db, mail, member, member_data)
+    # Setup
+    mail = MagicMock()
+    member = mock_member_factory(0)
+    member_data[MemberKey.EMAIL] = email
+    member_data[MemberKey.VER_STATE] = State.AWAIT_CODE
 
-        # Ensure proc_send_email called.
-        mock_proc_send_email.assert_awaited_once_with(db, mail, member,
-            member_data, email)
+    # Call
+    await proc_resend_email(mock_db, mail, member, member_data)
 
-        # Ensure no side effects occurred.
-        member.send.assert_not_awaited()
-        member.add_roles.assert_not_called()
-        db.set_member_data.assert_not_called()
+    # Ensure proc_send_email called.
+    mock_proc_send_email.assert_awaited_once_with(mock_db, mail, member,
+        member_data, email)
 
-@pytest.mark.asyncio
-async def test_proc_resend_email_not_awaiting_code():
+    # Ensure no side effects occurred.
+    assert_no_side_effects(member.send, member.add_roles,
+        mock_db.set_member_data)
+
+@pytest.mark.parametrize("email", VALID_EMAILS)
+@pytest.mark.parametrize("state",
+    [s for s in State if s != State.AWAIT_CODE], ids=state_id)
+async def test_proc_resend_email_not_awaiting_code(email, state, mock_db,
+    member_data, mock_proc_send_email, mock_member_factory):
     """User not awaiting code ignored."""
-    for email in VALID_EMAILS:
-        for state in State:
-            if state == State.AWAIT_CODE:
-                pass
-        # Setup
-        db = MagicMock()
-        mail = MagicMock()
-        member = new_mock_user(0)
-        member_data = make_def_member_data()
-        member_data[MemberKey.EMAIL] = email
-        member_data[MemberKey.VER_STATE] = state
+    # Setup
+    mail = MagicMock()
+    member = mock_member_factory(0)
+    member_data[MemberKey.EMAIL] = email
+    member_data[MemberKey.VER_STATE] = state
 
-        # Call
-        with patch("iam.verify.proc_send_email") as mock_proc_send_email:
-            await proc_resend_email(db, mail, member, member_data)
+    # Call
+    await proc_resend_email(mock_db, mail, member, member_data)
 
-        # Ensure proc_send_email not called.
-        mock_proc_send_email.assert_not_awaited()
+    # Ensure proc_send_email not called.
+    mock_proc_send_email.assert_not_awaited()
 
-        # Ensure no side effects occurred.
-        member.send.assert_not_awaited()
-        member.add_roles.assert_not_called()
-        db.set_member_data.assert_not_called()
+    # Ensure no side effects occurred.
+    assert_no_side_effects(member.send, member.add_roles,
+        mock_db.set_member_data)
 
-@pytest.mark.asyncio
-async def test_state_await_id_standard():
+@pytest.mark.parametrize("n_attach", SAMPLE_ATTACH_COUNTS)
+async def test_state_await_id_standard(n_attach, mock_db, member_data,
+    mock_member_factory, mock_channel_factory, mock_attachments):
     """User sending attachments forwarded to admin channel."""
-    for n_attach in range(1, 11):
-        # Setup
-        db = MagicMock()
-        member = new_mock_user(0)
-        admin_channel = new_mock_channel(1)
-        member_data = make_def_member_data()
-        attachments = [new_mock_attachment(i) for i in range(n_attach)]
+    # Setup
+    member = mock_member_factory(0)
+    admin_channel = mock_channel_factory(1)
+    attachments = list(mock_attachments[:n_attach])
 
-        # Call
-        with patch("iam.verify.proc_forward_id_admins") as \
-            mock_proc_forward_id_admins:
-            await state_await_id(db, admin_channel, member, member_data,
-                attachments)
+    # Call
+    with patch("iam.verify.proc_forward_id_admins") as \
+        mock_proc_forward_id_admins:
+        await state_await_id(mock_db, admin_channel, member, member_data,
+            attachments)
 
-        # Ensure proc_forward_id_admins called.
-        mock_proc_forward_id_admins.assert_awaited_once_with(db, member,
-            admin_channel, member_data, attachments)
+    # Ensure proc_forward_id_admins called.
+    mock_proc_forward_id_admins.assert_awaited_once_with(mock_db, member,
+        admin_channel, member_data, attachments)
 
-        # Ensure no side effects occurred.
-        member.add_roles.assert_not_called()
-        db.set_member_data.assert_not_called()
+    # Ensure no side effects occurred.
+    assert_no_side_effects(member.add_roles, mock_db.set_member_data)
 
-@pytest.mark.asyncio
-async def test_state_await_id_no_attachments():
+async def test_state_await_id_no_attachments(mock_db, member_data,
+    mock_member_factory, mock_channel_factory):
     """User sending no attachments sent error."""
     # Setup
-    db = MagicMock()
-    member = new_mock_user(0)
-    admin_channel = new_mock_channel(1)
-    member_data = make_def_member_data()
+    member = mock_member_factory(0)
+    admin_channel = mock_channel_factory(1)
     attachments = []
 
     # Call
     with patch("iam.verify.proc_forward_id_admins") as \
         mock_proc_forward_id_admins:
-        await state_await_id(db, admin_channel, member, member_data,
+        await state_await_id(mock_db, admin_channel, member, member_data,
             attachments)
 
     # Ensure proc_forward_id_admins not called.
@@ -835,74 +824,65 @@ async def test_state_await_id_no_attachments():
         "again.")
 
     # Ensure no side effects occurred.
-    member.add_roles.assert_not_called()
-    db.set_member_data.assert_not_called()
+    assert_no_side_effects(member.add_roles, mock_db.set_member_data)
 
-@pytest.mark.asyncio
-async def test_proc_forward_id_admins_standard():
+@pytest.mark.parametrize("full_name,n_attach", FORWARD_ID_CASES)
+async def test_proc_forward_id_admins_standard(full_name, n_attach, mock_db,
+    member_data, mock_member, mock_admin_channel, mock_message_factory,
+    mock_attachments):
     """Message containing attachments sent to admin channel."""
-    for full_name in VALID_NAMES:
-        for n_attach in range(1, 11):
-            # Setup
-            db = MagicMock()
-            member = new_mock_user(0)
-            admin_channel = new_mock_channel(1)
-            admin_channel.send.return_value = new_mock_message(1337)
-            member_data = make_def_member_data()
-            member_data[MemberKey.NAME] = full_name
-            attachments = [new_mock_attachment(i) for i in range(n_attach)]
+    # Setup
+    mock_admin_channel.send.return_value = mock_message_factory(1337)
+    member_data[MemberKey.NAME] = full_name
+    attachments = list(mock_attachments[:n_attach])
 
-            # Call
-            await proc_forward_id_admins(db, member, admin_channel,
-                member_data, attachments)
-
-            # Ensure attachments forwarded to admin channel.
-            admin_channel.send.assert_awaited_once_with("Received "
-                f"attachment(s) from {member.mention}. Please verify that "
-                f"name on ID is `{full_name}`, then type `{PREFIX}verify "
-                f"approve {member.id}` or `{PREFIX}verify reject {member.id} "
-                "\"reason\"`.", files=[await a.to_file() for a in attachments])
-
-            # Ensure user entry in database updated accordingly.
-            call_args_list = db.update_member_data.call_args_list
-            assert len(call_args_list) == 2
-            call_args = call_args_list[0].args
-            assert call_args == (member.id, {MemberKey.ID_MESSAGE: 1337})
-
-            # Ensure notification sent to user.
-            member.send.assert_awaited_once_with("Your attachment(s) have "
-                "been forwarded to the execs. Please wait.")
-
-            # Ensure user state updated to awaiting approval.
-            call_args = call_args_list[1].args
-            assert call_args == (member.id,
-                {MemberKey.VER_STATE: State.AWAIT_APPROVAL})
+    # Call
+    await proc_forward_id_admins(mock_db, mock_member, mock_admin_channel,
+        member_data, attachments)
+
+    # Ensure attachments forwarded to admin channel.
+    expected_files = [a.to_file.return_value for a in attachments]
+    mock_admin_channel.send.assert_awaited_once_with(
+        EXPECTED_ID_MSG.format(received="Received",
+            mention=mock_member.mention, full_name=full_name,
+            prefix=PREFIX, uid=mock_member.id),
+        files=expected_files)
+    for attachment in attachments:
+        attachment.to_file.assert_awaited_once()
+
+    # Ensure user entry in database updated with message ID, then state
+    # updated to awaiting approval.
+    assert mock_db.update_member_data.call_args_list == [
+        call(mock_member.id, {MemberKey.ID_MESSAGE: 1337}),
+        call(mock_member.id, {MemberKey.VER_STATE: State.AWAIT_APPROVAL})
+    ]
+
+    # Ensure notification sent to user.
+    mock_member.send.assert_awaited_once_with("Your attachment(s) have "
+        "been forwarded to the execs. Please wait.")
 
-            # Ensure no side effects occurred.
-            member.add_roles.assert_not_called()
-            db.set_member_data.assert_not_called()
+    # Ensure no side effects occurred.
+    assert_no_side_effects(mock_member.add_roles, mock_db.set_member_data)
 
-@pytest.mark.asyncio
-async def test_proc_exec_approve_standard():
+async def test_proc_exec_approve_standard(mock_db, member_data,
+    mock_member_factory, mock_channel_factory):
     """Exec approving verifying user grants rank to user."""
     # Setup
-    db = MagicMock()
-    member = new_mock_user(0)
-    member_data = make_def_member_data()
+    member = mock_member_factory(0)
     member_data[MemberKey.VER_STATE] = State.AWAIT_APPROVAL
-    db.get_member_data.return_value = member_data
-    exec = new_mock_user(1)
-    channel = new_mock_channel(2)
-    join_announce_channel = new_mock_channel(3)
+    mock_db.get_member_data.return_value = member_data
+    exec = mock_member_factory(1)
+    channel = mock_channel_factory(2)
+    join_announce_channel = mock_channel_factory(3)
     ver_role = AsyncMock()
 
     # Call
     with patch("iam.verify.proc_grant_rank") as mock_proc_grant_rank:
-        await proc_exec_approve(db, channel, member, join_announce_channel,
-            exec, ver_role)
+        await proc_exec_approve(mock_db, channel, member,
+            join_announce_channel, exec, ver_role)
 
     # Ensure user entry in database updated accordingly.
-    db.update_member_data.assert_called_once_with(member.id, {
+    mock_db.update_member_data.assert_called_once_with(member.id, {
         MemberKey.ID_VER: True,
         MemberKey.VER_EXEC: exec.id
     })
@@ -912,124 +892,25 @@ async def test_proc_exec_approve_standard():
         join_announce_channel, member)
 
     # Ensure no side effects occurred.
-    member.send.assert_not_awaited()
-    member.add_roles.assert_not_called()
-    db.set_member_data.assert_not_called()
-
-@pytest.mark.asyncio
-async def test_proc_exec_approve_not_awaiting():
-    """Exec approving user not awaiting approval sends error."""
-    for state in State:
-        if state == State.AWAIT_APPROVAL:
-            continue
-        # Setup
-        db = MagicMock()
-        member = new_mock_user(0)
-        member_data = make_def_member_data()
-        member_data[MemberKey.VER_STATE] = state
-        db.get_member_data.return_value = member_data
-        exec = new_mock_user(1)
-        channel = new_mock_channel(2)
-        ver_role = AsyncMock()
-
-        # Call
-        with patch("iam.verify.proc_grant_rank") as mock_proc_grant_rank:
-            with pytest.raises(CheckFailed) as exc:
-                await proc_exec_approve(db, channel, member, None, exec,
-                    ver_role)
-        await exc.value.notify()
-
-        # Ensure error sent to channel.
-        channel.send.assert_awaited_once_with("That user is not awaiting "
-            "approval.")
-
-        # Ensure no side effects occurred.
-        mock_proc_grant_rank.assert_not_awaited()
-        member.send.assert_not_awaited()
-        member.add_roles.assert_not_called()
-        db.update_member_data.assert_not_called()
-        db.set_member_data.assert_not_called()
-
-@pytest.mark.asyncio
-async def test_proc_exec_approve_already_verified():
-    """Exec approving user already verified sends error."""
-    for state in State:
-        # Setup
-        db = MagicMock()
-        member = new_mock_user(0)
-        member_data = make_def_member_data()
-        member_data[MemberKey.ID_VER] = True
-        member_data[MemberKey.VER_STATE] = state
-        db.get_member_data.return_value = member_data
-        exec = new_mock_user(1)
-        channel = new_mock_channel(2)
-        ver_role = AsyncMock()
-
-        # Call
-        with patch("iam.verify.proc_grant_rank") as mock_proc_grant_rank:
-            with pytest.raises(CheckFailed) as exc:
-                await proc_exec_approve(db, channel, member, None, exec,
-                    ver_role)
-        await exc.value.notify()
-
-        # Ensure error sent to channel.
-        channel.send.assert_awaited_once_with("That user is already verified.")
-
-        # Ensure no side effects occurred.
-        mock_proc_grant_rank.assert_not_awaited()
-        member.send.assert_not_awaited()
-        member.add_roles.assert_not_called()
-        db.update_member_data.assert_not_called()
-        db.set_member_data.assert_not_called()
-
-@pytest.mark.asyncio
-async def test_proc_exec_approve_never_verifying():
-    """Exec approving user never started verification sends error."""
-    for state in State:
-        # Setup
-        db = MagicMock()
-        member = new_mock_user(0)
-        db.get_member_data = MagicMock(side_effect=
-            MemberNotFound(member.id, ""))
-        exec = new_mock_user(1)
-        channel = new_mock_channel(2)
-        ver_role = AsyncMock()
-
-        # Call
-        with patch("iam.verify.proc_grant_rank") as mock_proc_grant_rank:
-            with pytest.raises(CheckFailed) as exc:
-                await proc_exec_approve(db, channel, member, None, exec,
-                    ver_role)
-        await exc.value.notify()
-
-        # Ensure error sent to channel.
-        channel.send.assert_awaited_once_with("That user is not currently "
-            "being verified.")
+    assert_no_side_effects(member.send, member.add_roles,
+        mock_db.set_member_data)
 
-        # Ensure no side effects occurred.
-        mock_proc_grant_rank.assert_not_awaited()
-        member.send.assert_not_awaited()
-        member.add_roles.assert_not_called()
-        db.update_member_data.assert_not_called()
-        db.set_member_data.assert_not_called()
-
-@pytest.mark.asyncio
-async def test_proc_exec_reject_standard():
+async def test_proc_exec_reject_standard(mock_db, member_data,
+    mock_member_factory, mock_channel_factory):
     """Exec rejecting verifying user notifies user and updates accordingly."""
+    # Setup
+    member = mock_member_factory(0)
+    channel = mock_channel_factory(1)
     for reason in SAMPLE_REJECT_REASONS:
-        # Setup
-        db = MagicMock()
-        member = new_mock_user(0)
-        member_data = make_def_member_data()
+        reset_mocks(mock_db, member, channel)
         member_data[MemberKey.VER_STATE] = State.AWAIT_APPROVAL
-        db.get_member_data.return_value = member_data
-        channel = new_mock_channel(1)
+        mock_db.get_member_data.return_value = member_data
 
         # Call
-        await proc_exec_reject(db, channel, member, reason)
+        await proc_exec_reject(mock_db, channel, member, reason)
 
         # Ensure user entry in database updated accordingly.
-        db.update_member_data.assert_called_once_with(member.id, {
+        mock_db.update_member_data.assert_called_once_with(member.id, {
             MemberKey.VER_STATE: None
         })
 
@@ -1044,415 +925,272 @@ async def test_proc_exec_reject_standard():
             f"from {member.mention}.")
 
         # Ensure no side effects occurred.
-        member.add_roles.assert_not_called()
-        db.set_member_data.assert_not_called()
-
-@pytest.mark.asyncio
-async def test_proc_exec_reject_not_awaiting():
-    """Exec rejecting user not verifying sends error."""
-    for state in State:
-        if state == State.AWAIT_APPROVAL:
-            continue
-        # Setup
-        db = MagicMock()
-        member = new_mock_user(0)
-        member_data = make_def_member_data()
-        member_data[MemberKey.VER_STATE] = state
-        db.get_member_data.return_value = member_data
-        channel = new_mock_channel(1)
+        assert_no_side_effects(member.add_roles, mock_db.set_member_data)
 
-        # Call
-        with pytest.raises(CheckFailed) as exc:
-            await proc_exec_reject(db, channel, member, "test")
-        await exc.value.notify()
+@pytest.mark.parametrize("action", ["approve", "reject"])
+@pytest.mark.parametrize("prior,expected", APPROVAL_CHECK_CASES)
+async def test_proc_exec_decision(action, prior, expected, mock_db,
+    member_data, mock_member_factory, mock_channel_factory):
+    """Exec approving or rejecting user who cannot be approved sent error.
 
-        # Ensure error sent to channel.
-        channel.send.assert_awaited_once_with("That user is not awaiting "
-            "approval.")
-
-        # Ensure no side effects occurred.
-        member.send.assert_not_awaited()
-        member.add_roles.assert_not_called()
-        db.update_member_data.assert_not_called()
-        db.set_member_data.assert_not_called()
-
-@pytest.mark.asyncio
-async def test_proc_exec_reject_already_verified():
-    """Exec rejecting user already verified sends error."""
-    for state in State:
-        # Setup
-        db = MagicMock()
-        member = new_mock_user(0)
-        member_data = make_def_member_data()
-        member_data[MemberKey.ID_VER] = True
-        member_data[MemberKey.VER_STATE] = state
-        db.get_member_data.return_value = member_data
-        channel = new_mock_channel(1)
-
-        # Call
-        with pytest.raises(CheckFailed) as exc:
-            await proc_exec_reject(db, channel, member, "test")
-        await exc.value.notify()
-
-        # Ensure error sent to channel.
-        channel.send.assert_awaited_once_with("That user is already verified.")
-
-        # Ensure no side effects occurred.
-        member.send.assert_not_awaited()
-        member.add_roles.assert_not_called()
-        db.update_member_data.assert_not_called()
-        db.set_member_data.assert_not_called()
-
-@pytest.mark.asyncio
-async def test_proc_exec_reject_never_verifying():
-    """Exec rejecting user never started verification sends error."""
-    for state in State:
-        # Setup
-        db = MagicMock()
-        member = new_mock_user(0)
-        db.get_member_data = MagicMock(side_effect=
+    Covers users not awaiting approval, already verified or never verifying.
+    """
+    # Setup
+    member = mock_member_factory(0)
+    exec = mock_member_factory(1)
+    channel = mock_channel_factory(2)
+    channel.reply = AsyncMock()
+    ver_role = AsyncMock()
+    if prior is None:
+        mock_db.get_member_data = MagicMock(side_effect=
             MemberNotFound(member.id, ""))
-        channel = new_mock_channel(1)
+    else:
+        member_data.update(prior)
+        mock_db.get_member_data.return_value = member_data
 
-        # Call
+    # Call
+    with patch("iam.verify.proc_grant_rank") as mock_proc_grant_rank:
         with pytest.raises(CheckFailed) as exc:
-            await proc_exec_reject(db, channel, member, "test")
-        await exc.value.notify()
+            if action == "approve":
+                await proc_exec_approve(mock_db, channel, member, None, exec,
+                    ver_role)
+            else:
+                await proc_exec_reject(mock_db, channel, member, "test")
+    await exc.value.notify()
 
-        # Ensure error sent to channel.
-        channel.send.assert_awaited_once_with("That user is not currently "
-            "being verified.")
+    # Ensure error sent to channel.
+    channel.reply.assert_awaited_once_with(expected)
+    channel.send.assert_not_awaited()
 
-        # Ensure no side effects occurred.
-        member.send.assert_not_awaited()
-        member.add_roles.assert_not_called()
-        db.update_member_data.assert_not_called()
-        db.set_member_data.assert_not_called()
+    # Ensure no side effects occurred.
+    assert_no_side_effects(mock_proc_grant_rank, member.send, member.add_roles,
+        mock_db.update_member_data, mock_db.set_member_data)
 
-@pytest.mark.asyncio
+@pytest.mark.skip(reason="unimplemented")
 async def test_proc_display_pending_standard():
     """Send list of pending approvals on request."""
     pass
 
-@pytest.mark.asyncio
-async def test_proc_display_pending_none():
+async def test_proc_display_pending_none(mock_db, mock_guild_factory,
+    mock_channel_factory):
     """Send error if no pending approvals."""
     # Setup
-    db = MagicMock()
-    db.get_unverified_members_data.return_value = []
-    guild = new_mock_guild(0)
-    channel = new_mock_channel(1)
+    mock_db.get_unverified_members_data.return_value = []
+    guild = mock_guild_factory(0)
+    channel = mock_channel_factory(1)
 
     # Call
-    await proc_display_pending(db, guild, channel)
+    await proc_display_pending(mock_db, guild, channel)
 
     # Ensure error sent in channel.
     channel.send.assert_awaited_once_with("No members currently awaiting "
         "approval.")
 
-@pytest.mark.asyncio
-async def test_proc_resend_id_standard():
+async def test_proc_resend_id_standard(mock_db, member_data,
+    mock_member_factory, mock_channel_factory, mock_message_factory,
+    mock_attachments):
     """Retrieve previous message attachments and resend."""
+    # Setup
+    member = mock_member_factory(0)
+    channel = mock_channel_factory(1)
     for full_name in VALID_NAMES:
         for n_attach in range(1, 11):
-            # Setup
-            db = MagicMock()
-            member = new_mock_user(0)
-            member_data = make_def_member_data()
+            reset_mocks(mock_db, member, channel, *mock_attachments)
             member_data[MemberKey.NAME] = full_name
             member_data[MemberKey.ID_MESSAGE] = n_attach
             member_data[MemberKey.VER_STATE] = State.AWAIT_APPROVAL
-            db.get_member_data.return_value = member_data
-            channel = new_mock_channel(1)
-            attachments = [new_mock_attachment(i) for i in range(n_attach)]
-            channel.fetch_message.return_value = new_mock_message(n_attach,
+            mock_db.get_member_data.return_value = member_data
+            attachments = list(mock_attachments[:n_attach])
+            channel.fetch_message.return_value = mock_message_factory(n_attach,
                 attachments=attachments)
 
             # Call
-            await proc_resend_id(db, channel, member)
+            await proc_resend_id(mock_db, channel, member)
 
             # Ensure right message was fetched.
             channel.fetch_message.assert_awaited_once_with(n_attach)
 
             # Ensure attachments forwarded to channel.
-            channel.send.assert_awaited_once_with("Previously received "
-                f"attachment(s) from {member.mention}. Please verify that "
-                f"name on ID is `{full_name}`, then type `{PREFIX}verify "
-                f"approve {member.id}` or `{PREFIX}verify reject {member.id} "
-                "\"reason\"`.", files=[await a.to_file() for a in attachments])
+            expected_files = [a.to_file.return_value for a in attachments]
+            channel.send.assert_awaited_once_with(
+                EXPECTED_ID_MSG.format(received="Previously received",
+                    mention=member.mention, full_name=full_name,
+                    prefix=PREFIX, uid=member.id),
+                files=expected_files)
+            for attachment in attachments:
+                attachment.to_file.assert_awaited_once()
 
             # Ensure no side effects occurred.
-            member.send.assert_not_awaited()
-            member.add_roles.assert_not_called()
-            db.update_member_data.assert_not_called()
-            db.set_member_data.assert_not_called()
-
-@pytest.mark.asyncio
-async def test_proc_resend_id_not_awaiting():
-    """Send error if user not awaiting approval."""
-    for i in range(10):
-        for state in State:
-            if state == State.AWAIT_APPROVAL:
-                continue
-            # Setup
-            db = MagicMock()
-            member = new_mock_user(0)
-            member_data = make_def_member_data()
-            member_data[MemberKey.ID_MESSAGE] = i
-            member_data[MemberKey.VER_STATE] = state
-            db.get_member_data.return_value = member_data
-            channel = new_mock_channel(1)
-
-            # Call
-            with pytest.raises(CheckFailed) as exc:
-                await proc_resend_id(db, channel, member)
-            await exc.value.notify()
+            assert_no_side_effects(member.send, member.add_roles,
+                mock_db.update_member_data, mock_db.set_member_data)
 
-            # Ensure error sent in channel.
-            channel.send.assert_awaited_once_with("That user is not "
-                "awaiting approval.")
-
-            # Ensure no side effects occurred.
-            member.send.assert_not_awaited()
-            member.add_roles.assert_not_called()
-            db.update_member_data.assert_not_called()
-            db.set_member_data.assert_not_called()
-
-@pytest.mark.asyncio
-async def test_proc_resend_id_already_verified():
-    """Send error if user already verified."""
-    for i in range(10):
-        for state in State:
-            # Setup
-            db = MagicMock()
-            member = new_mock_user(0)
-            member_data = make_def_member_data()
-            member_data[MemberKey.ID_MESSAGE] = i
-            member_data[MemberKey.ID_VER] = True
-            member_data[MemberKey.VER_STATE] = state
-            db.get_member_data.return_value = member_data
-            channel = new_mock_channel(1)
-
-            # Call
-            with pytest.raises(CheckFailed) as exc:
-                await proc_resend_id(db, channel, member)
-            await exc.value.notify()
+@pytest.mark.parametrize("prior,expected", APPROVAL_CHECK_CASES)
+async def test_proc_resend_id_check_failed(prior, expected, mock_db,
+    member_data, mock_member_factory, mock_channel_factory):
+    """Send error if user cannot be approved.
 
-            # Ensure error sent in channel.
-            channel.send.assert_awaited_once_with("That user is already "
-                "verified.")
-
-            # Ensure no side effects occurred.
-            member.send.assert_not_awaited()
-            member.add_roles.assert_not_called()
-            db.update_member_data.assert_not_called()
-            db.set_member_data.assert_not_called()
-
-@pytest.mark.asyncio
-async def test_proc_resend_id_never_verifying():
-    """Send error if user never started verification."""
+    Covers users not awaiting approval, already verified or never verifying.
+    """
     # Setup
-    db = MagicMock()
-    member = new_mock_user(0)
-    db.get_member_data = MagicMock(side_effect=
-        MemberNotFound(member.id, ""))
-    channel = new_mock_channel(1)
+    member = mock_member_factory(0)
+    channel = mock_channel_factory(1)
+    channel.reply = AsyncMock()
+    if prior is None:
+        mock_db.get_member_data = MagicMock(side_effect=
+            MemberNotFound(member.id, ""))
+    else:
+        member_data.update(prior)
+        mock_db.get_member_data.return_value = member_data
+    for i in range(10):
+        reset_mocks(member, channel)
+        member_data[MemberKey.ID_MESSAGE] = i
 
-    # Call
-    with pytest.raises(CheckFailed) as exc:
-        await proc_resend_id(db, channel, member)
-    await exc.value.notify()
+        # Call
+        with pytest.raises(CheckFailed) as exc:
+            await proc_resend_id(mock_db, channel, member)
+        await exc.value.notify()
 
-    # Ensure error sent in channel.
-    channel.send.assert_awaited_once_with("That user is not currently "
-        "being verified.")
+        # Ensure error sent in channel.
+        channel.reply.assert_awaited_once_with(expected)
+        channel.send.assert_not_awaited()
 
-    # Ensure no side effects occurred.
-    member.send.assert_not_awaited()
-    member.add_roles.assert_not_called()
-    db.update_member_data.assert_not_called()
-    db.set_member_data.assert_not_called()
+        # Ensure no side effects occurred.
+        assert_no_side_effects(member.send, member.add_roles,
+            mock_db.update_member_data, mock_db.set_member_data)
 
-@pytest.mark.asyncio
-async def test_proc_resend_id_not_found():
+async def test_proc_resend_id_not_found(mock_db, member_data,
+    mock_member_factory, mock_channel_factory):
     """Send error if previous message containing attachments not found."""
+    # Setup
+    member = mock_member_factory(0)
+    channel = mock_channel_factory(1)
+    channel.fetch_message = MagicMock(side_effect=
+        NotFound(MagicMock(), MagicMock()))
     for i in range(10):
-        # Setup
-        db = MagicMock()
-        member = new_mock_user(0)
-        member_data = make_def_member_data()
+        reset_mocks(mock_db, member, channel)
         member_data[MemberKey.ID_MESSAGE] = i
         member_data[MemberKey.VER_STATE] = State.AWAIT_APPROVAL
-        db.get_member_data.return_value = member_data
-        channel = new_mock_channel(1)
-        channel.fetch_message = MagicMock(side_effect=
-            NotFound(MagicMock(), MagicMock()))
+        mock_db.get_member_data.return_value = member_data
 
         # Call
-        await proc_resend_id(db, channel, member)
+        await proc_resend_id(mock_db, channel, member)
 
         # Ensure error sent in channel.
         channel.send.assert_awaited_once_with("Could not find previous message"
             " in this channel containing attachments! Perhaps it was deleted?")
 
         # Ensure no side effects occurred.
-        member.send.assert_not_awaited()
-        member.add_roles.assert_not_called()
-        db.update_member_data.assert_not_called()
-        db.set_member_data.assert_not_called()
+        assert_no_side_effects(member.send, member.add_roles,
+            mock_db.update_member_data, mock_db.set_member_data)
 
-@pytest.mark.asyncio
-async def test_proc_verify_manual_unsw_standard():
+async def test_proc_verify_manual_unsw_standard(mock_db, member_data,
+    frozen_time, mock_member_factory, mock_channel_factory):
     """Create new user entry in database and verify user."""
+    # Setup
+    member = mock_member_factory(0)
+    exec = mock_member_factory(1)
+    channel = mock_channel_factory(2)
+    join_announce_channel = mock_channel_factory(3)
+    ver_role = AsyncMock()
     for full_name in VALID_NAMES:
         for zid in VALID_ZIDS:
-            # Setup
-            db = MagicMock()
-            member = new_mock_user(0)
-            exec = new_mock_user(1)
-            channel = new_mock_channel(2)
-            join_announce_channel = new_mock_channel(3)
-            ver_role = AsyncMock()
-            before_time = time()
+            reset_mocks(mock_db, member, exec, channel, join_announce_channel,
+                ver_role)
 
             # Call
             with patch("iam.verify.proc_grant_rank") as mock_proc_grant_rank:
-                await proc_verify_manual(db, ver_role, channel,
+                await proc_verify_manual(mock_db, ver_role, channel,
                     join_announce_channel, exec, member, full_name, zid)
 
             # Ensure user entry in database created accordingly.
-            member_data = make_def_member_data()
             member_data[MemberKey.NAME] = full_name
             member_data[MemberKey.ZID] = zid
             member_data[MemberKey.EMAIL_VER] = True
             member_data[MemberKey.ID_VER] = True
             member_data[MemberKey.VER_EXEC] = exec.id
             member_data[MemberKey.EMAIL] = f"{zid}@student.unsw.edu.au"
-            db.set_member_data.assert_called_once()
-            call_args = db.set_member_data.call_args.args
-            assert call_args[0] == member.id
-            assert call_args[1][MemberKey.VER_TIME] >= before_time and \
-                call_args[1][MemberKey.VER_TIME] < time()
-            assert filter_dict(call_args[1], [MemberKey.VER_TIME]) == \
-                filter_dict(member_data, [MemberKey.VER_TIME])
+            member_data[MemberKey.VER_TIME] = frozen_time
+            mock_db.set_member_data.assert_called_once_with(member.id,
+                member_data)
 
             # Ensure user granted rank.
             mock_proc_grant_rank.assert_awaited_once_with(ver_role, channel,
                 join_announce_channel, member)
 
             # Ensure no side effects occurred.
-            member.send.assert_not_awaited()
-            member.add_roles.assert_not_called()
-            db.update_member_data.assert_not_called()
-
-@pytest.mark.asyncio
-async def test_proc_verify_manual_unsw_invalid_zid():
-    """Send error if invalid zID entered."""
-    for full_name in VALID_NAMES:
-        for zid in INVALID_ZIDS:
-            # Setup
-            db = MagicMock()
-            member = new_mock_user(0)
-            exec = new_mock_user(1)
-            channel = new_mock_channel(2)
-            ver_role = AsyncMock()
-            before_time = time()
-
-            # Call
-            with patch("iam.verify.proc_grant_rank") as mock_proc_grant_rank:
-                await proc_verify_manual(db, ver_role, channel, None, exec,
-                    member, full_name, zid)
-
-            # Ensure error sent in channel.
-            channel.send.assert_awaited_once_with("That is neither a valid "
-                "zID nor a valid email.")
+            assert_no_side_effects(member.send, member.add_roles,
+                mock_db.update_member_data)
 
-            # Ensure no side effects occurred.
-            mock_proc_grant_rank.assert_not_awaited()
-            member.send.assert_not_awaited()
-            member.add_roles.assert_not_called()
-            db.set_member_data.assert_not_called()
-            db.update_member_data.assert_not_called()
-
-@pytest.mark.asyncio
-async def test_proc_verify_manual_non_unsw_standard():
+async def test_proc_verify_manual_non_unsw_standard(mock_db, member_data,
+    frozen_time, mock_member_factory, mock_channel_factory):
     """Create new user entry in database and verify user."""
+    # Setup
+    member = mock_member_factory(0)
+    exec = mock_member_factory(1)
+    channel = mock_channel_factory(2)
+    join_announce_channel = mock_channel_factory(3)
+    ver_role = AsyncMock()
     for full_name in VALID_NAMES:
         for email in VALID_EMAILS:
-            # Setup
-            db = MagicMock()
-            member = new_mock_user(0)
-            exec = new_mock_user(1)
-            channel = new_mock_channel(2)
-            join_announce_channel = new_mock_channel(3)
-            ver_role = AsyncMock()
-            before_time = time()
+            reset_mocks(mock_db, member, exec, channel, join_announce_channel,
+                ver_role)
 
             # Call
             with patch("iam.verify.proc_grant_rank") as mock_proc_grant_rank:
-                await proc_verify_manual(db, ver_role, channel,
+                await proc_verify_manual(mock_db, ver_role, channel,
                     join_announce_channel, exec, member, full_name, email)
 
             # Ensure user entry in database created accordingly.
-            member_data = make_def_member_data()
             member_data[MemberKey.NAME] = full_name
             member_data[MemberKey.EMAIL] = email
             member_data[MemberKey.EMAIL_VER] = True
             member_data[MemberKey.ID_VER] = True
             member_data[MemberKey.VER_EXEC] = exec.id
-            db.set_member_data.assert_called_once()
-            call_args = db.set_member_data.call_args.args
-            assert call_args[0] == member.id
-            assert call_args[1][MemberKey.VER_TIME] >= before_time and \
-                call_args[1][MemberKey.VER_TIME] < time()
-            assert filter_dict(call_args[1], [MemberKey.VER_TIME]) == \
-                filter_dict(member_data, [MemberKey.VER_TIME])
+            member_data[MemberKey.VER_TIME] = frozen_time
+            mock_db.set_member_data.assert_called_once_with(member.id,
+                member_data)
 
             # Ensure user granted rank.
             mock_proc_grant_rank.assert_awaited_once_with(ver_role, channel,
                 join_announce_channel, member)
 
             # Ensure no side effects occurred.
-            member.send.assert_not_awaited()
-            member.add_roles.assert_not_called()
-            db.update_member_data.assert_not_called()
+            assert_no_side_effects(member.send, member.add_roles,
+                mock_db.update_member_data)
 
-@pytest.mark.asyncio
-async def test_proc_verify_manual_non_unsw_invalid_email():
-    """Send error if invalid email entered."""
+@pytest.mark.parametrize("arg", INVALID_ZIDS + INVALID_EMAILS)
+async def test_proc_verify_manual_invalid(arg, mock_db, mock_member_factory,
+    mock_channel_factory):
+    """Send error if neither a valid zID nor a valid email entered."""
+    # Setup
+    member = mock_member_factory(0)
+    exec = mock_member_factory(1)
+    channel = mock_channel_factory(2)
+    ver_role = AsyncMock()
     for full_name in VALID_NAMES:
-        for email in INVALID_EMAILS:
-            # Setup
-            db = MagicMock()
-            member = new_mock_user(0)
-            exec = new_mock_user(1)
-            channel = new_mock_channel(2)
-            ver_role = AsyncMock()
-            before_time = time()
+        reset_mocks(mock_db, member, exec, channel, ver_role)
 
-            # Call
-            with patch("iam.verify.proc_grant_rank") as mock_proc_grant_rank:
-                await proc_verify_manual(db, ver_role, channel, None, exec,
-                    member, full_name, email)
+        # Call
+        with patch("iam.verify.proc_grant_rank") as mock_proc_grant_rank:
+            await proc_verify_manual(mock_db, ver_role, channel, None,
+                exec, member, full_name, arg)
 
-            # Ensure error sent in channel.
-            channel.send.assert_awaited_once_with("That is neither a valid "
-                "zID nor a valid email.")
+        # Ensure error sent in channel.
+        channel.send.assert_awaited_once_with("That is neither a valid "
+            "zID nor a valid email.")
 
-            # Ensure no side effects occurred.
-            mock_proc_grant_rank.assert_not_awaited()
-            member.send.assert_not_awaited()
-            member.add_roles.assert_not_called()
-            db.set_member_data.assert_not_called()
-            db.update_member_data.assert_not_called()
-
-@pytest.mark.asyncio
-async def test_proc_grant_rank_standard():
+        # Ensure no side effects occurred.
+        assert_no_side_effects(mock_proc_grant_rank, member.send,
+            member.add_roles, mock_db.set_member_data,
+            mock_db.update_member_data)
+
+async def test_proc_grant_rank_standard(mock_member_factory,
+    mock_channel_factory):
     """User granted rank and notified. Admin channel notified."""
     # Setup
-    member = new_mock_user(0)
-    admin_channel = new_mock_channel(1)
-    join_announce_channel = new_mock_channel(2)
+    member = mock_member_factory(0)
+    admin_channel = mock_channel_factory(1)
+    join_announce_channel = mock_channel_factory(2)
     ver_role = AsyncMock()
 
     # Call
@@ -1471,13 +1209,13 @@ async def test_proc_grant_rank_standard():
     join_announce_channel.send.assert_awaited_once_with("Welcome "
         f"{member.mention} to PCSoc!")
 
-@pytest.mark.asyncio
-async def test_proc_grant_rank_silent():
+async def test_proc_grant_rank_silent(mock_member_factory,
+    mock_channel_factory):
     """User granted rank. No notifications sent."""
     # Setup
-    member = new_mock_user(0)
-    admin_channel = new_mock_channel(1)
-    join_announce_channel = new_mock_channel(2)
+    member = mock_member_factory(0)
+    admin_channel = mock_channel_factory(1)
+    join_announce_channel = mock_channel_factory(2)
     ver_role = AsyncMock()
 
     # Call
@@ -1488,6 +1226,5 @@ async def test_proc_grant_rank_silent():
     member.add_roles.assert_awaited_once_with(ver_role)
 
     # Ensure no side effects occurred.
-    member.send.assert_not_awaited()
-    admin_channel.send.assert_not_awaited()
-    join_announce_channel.send.assert_not_awaited()
+    assert_no_side_effects(member.send, admin_channel.send,
+        join_announce_channel.send)